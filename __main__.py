@@ -1,85 +1,78 @@
 from __future__ import annotations
 
-import asyncio
-import contextlib
-import logging
-from pathlib import Path
-from typing import TYPE_CHECKING, Any
-
-import aiohttp
-import asyncpg
-import click
-import discord
-from discord.ext import commands
-
-from config import DATABASE_CRED, TEST_TOKEN, TOKEN
-from utilities.bases.bot import Cyrene
-
-if TYPE_CHECKING:
-    from collections.abc import Generator
-
-
-@contextlib.contextmanager
-def setup_logging() -> Generator[Any, Any, Any]:
-    discord.utils.setup_logging()
-
-    logging.getLogger('discord').setLevel(logging.WARNING)
-    logging.getLogger('discord.http').setLevel(logging.WARNING)
-    yield
-
+import sys
 
-async def create_bot_pool() -> asyncpg.Pool[asyncpg.Record]:
-    pool = await asyncpg.create_pool(DATABASE_CRED)
+from utilities.profiling import startup_profiler
 
-    if not pool or pool.is_closing():
-        msg = 'Failed to create a pool.'
-        raise RuntimeError(msg)
+if '--profile-startup' in sys.argv:
+    startup_profiler.enable()  # Before the imports below, so they are timed too
 
-    with Path('schema.sql').open(encoding='utf-8') as file:  # noqa: ASYNC230
-        await pool.execute(file.read())
-
-    return pool
-
-
-async def _callable_prefix(bot: Cyrene, message: discord.Message) -> list[str]:
-    prefixes = commands.when_mentioned(bot, message)
+import asyncio
+from pathlib import Path
 
-    prefixes.extend(bot.get_prefixes(message.guild))
+import click
 
-    return prefixes
+from config import CACHE_PROFILE, CACHE_PROFILES, EVENT_LOOP, TEST_TOKEN, TOKEN
+from launcher import create_bot_pool, run_bot, run_clusters, setup_logging
+from utilities.event_loop import EVENT_LOOPS, loop_factory
 
 
 @click.command()
 @click.option('--production', is_flag=True)
-def run(*, production: bool) -> None:
+@click.option('--migrate-only', is_flag=True, help='Apply database migrations and exit without connecting to Discord.')
+@click.option('--cache-profile', type=click.Choice(list(CACHE_PROFILES)), default=CACHE_PROFILE, show_default=True)
+@click.option('--event-loop', type=click.Choice(EVENT_LOOPS), default=EVENT_LOOP, show_default=True)
+@click.option('--cluster', 'clusters', type=click.IntRange(min=1), help='Run the shards across this many processes.')
+@click.option('--shard-count', type=click.IntRange(min=1), help='Total shards when clustered. Defaults to the recommended.')
+@click.option('--profile-startup', is_flag=True, help='Write a report of where the startup time goes.')
+@click.option('--profile-output', type=click.Path(dir_okay=False, path_type=Path), default=Path('startup-profile.json'))
+@click.option('--profile-sample-interval', type=float, help='Also sample stacks every this many seconds for a flame graph.')
+def run(
+    *,
+    production: bool,
+    migrate_only: bool,
+    cache_profile: str,
+    event_loop: str,
+    clusters: int | None,
+    shard_count: int | None,
+    profile_startup: bool,
+    profile_output: Path,
+    profile_sample_interval: float | None,
+) -> None:
     token = TOKEN if production else TEST_TOKEN
-    with setup_logging():
 
-        async def run_bot(token: str) -> None:
-            pool = await create_bot_pool()
-            allowed_mentions = discord.AllowedMentions(everyone=False, users=True, roles=False, replied_user=False)
-            intents = discord.Intents.all()
-            session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=60))
-
-            extensions = [
-                'extensions.animanga',
-                'extensions.internals',
-                'extensions.meta',
-                'extensions.utility',
-                'extensions.tracksy',
-            ]
-
-            async with Cyrene(
-                command_prefix=_callable_prefix,
-                extensions=extensions,
-                allowed_mentions=allowed_mentions,
-                intents=intents,
-                session=session,
-            ) as bot:
-                bot.pool = pool
-                await bot.start(token)
-
-        asyncio.run(run_bot(token=token))
+    if profile_startup:
+        startup_profiler.output = profile_output
+        if profile_sample_interval:
+            startup_profiler.start_sampling(profile_sample_interval)
+
+    with setup_logging():
+        factory = loop_factory(event_loop)
+
+        if migrate_only:
+
+            async def migrate() -> None:
+                pool = await create_bot_pool()
+                await pool.close()
+
+            asyncio.run(migrate(), loop_factory=factory)
+            return
+
+        if clusters:
+            asyncio.run(
+                run_clusters(
+                    token,
+                    cache_profile=cache_profile,
+                    event_loop=event_loop,
+                    clusters=clusters,
+                    shard_count=shard_count,
+                    profile_output=profile_output if profile_startup else None,
+                ),
+                loop_factory=factory,
+            )
+            return
+
+        asyncio.run(run_bot(token, cache_profile=cache_profile), loop_factory=factory)
 
 
 if __name__ == '__main__':
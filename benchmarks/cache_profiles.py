@@ -0,0 +1,189 @@
+"""
+Measure memory and guild processing time of each cache profile in config.py.
+
+A fixed, seeded set of synthetic guilds is fed through the library's connection
+state the same way GUILD_CREATE and MESSAGE_CREATE events are during startup.
+GUILD_CREATE only carries the online share of the members, the rest is added as
+if chunked when the profile chunks guilds at startup. Network time is not measured.
+
+Run from the repository root with ``python -m benchmarks.cache_profiles``.
+Requires the same environment variables as the bot, since config.py is imported.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import random
+import time
+import tracemalloc
+from typing import Any
+
+import discord
+
+from config import CACHE_PROFILES
+
+BOT_ID = 1
+
+
+def user_payload(user_id: int) -> dict[str, Any]:
+    return {
+        'id': str(user_id),
+        'username': f'user{user_id}',
+        'discriminator': '0',
+        'global_name': None,
+        'avatar': None,
+        'bot': False,
+    }
+
+
+def member_payload(member_id: int) -> dict[str, Any]:
+    return {
+        'user': user_payload(member_id),
+        'roles': [],
+        'joined_at': '2024-01-01T00:00:00+00:00',
+        'deaf': False,
+        'mute': False,
+        'flags': 0,
+    }
+
+
+def guild_payload(guild_id: int, member_ids: list[int], member_count: int) -> dict[str, Any]:
+    channel_id = guild_id * 10
+
+    return {
+        'id': str(guild_id),
+        'name': f'guild{guild_id}',
+        'owner_id': str(member_ids[-1]),
+        'member_count': member_count,
+        'features': [],
+        'emojis': [],
+        'stickers': [],
+        'roles': [
+            {
+                'id': str(guild_id),
+                'name': '@everyone',
+                'permissions': '0',
+                'position': 0,
+                'color': 0,
+                'hoist': False,
+                'managed': False,
+                'mentionable': False,
+                'flags': 0,
+            }
+        ],
+        'channels': [
+            {'id': str(channel_id), 'type': 0, 'name': 'general', 'position': 0, 'permission_overwrites': []},
+        ],
+        'members': [member_payload(member_id) for member_id in member_ids],
+        'presences': [
+            {'user': {'id': str(member_id)}, 'status': 'online', 'activities': [], 'client_status': {'desktop': 'online'}}
+            for member_id in member_ids
+        ],
+        'voice_states': [],
+        'threads': [],
+        'stage_instances': [],
+        'guild_scheduled_events': [],
+    }
+
+
+def message_payload(message_id: int, guild_id: int, author_id: int) -> dict[str, Any]:
+    return {
+        'id': str(message_id),
+        'channel_id': str(guild_id * 10),
+        'guild_id': str(guild_id),
+        'author': user_payload(author_id),
+        'content': 'c!help',
+        'timestamp': '2024-01-01T00:00:00+00:00',
+        'edited_timestamp': None,
+        'tts': False,
+        'mention_everyone': False,
+        'mentions': [],
+        'mention_roles': [],
+        'attachments': [],
+        'embeds': [],
+        'pinned': False,
+        'type': 0,
+    }
+
+
+async def measure(
+    profile: dict[str, Any],
+    guilds: list[dict[str, Any]],
+    offline: dict[int, list[int]],
+    messages: list[dict[str, Any]],
+) -> tuple[float, int]:
+    client = discord.Client(
+        intents=profile['intents'],
+        member_cache_flags=profile['member_cache_flags'],
+        chunk_guilds_at_startup=profile['chunk_guilds_at_startup'],
+        max_messages=profile['max_messages'],
+    )
+    state = client._connection
+    state.user = discord.ClientUser(state=state, data=user_payload(BOT_ID))
+
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+
+    for data in guilds:
+        # Payloads are consumed destructively by some parsers
+        guild = state._add_guild_from_data({**data})  # pyright: ignore[reportArgumentType]
+
+        if profile['chunk_guilds_at_startup']:
+            for member_id in offline[guild.id]:
+                guild._add_member(discord.Member(data=member_payload(member_id), guild=guild, state=state))  # pyright: ignore[reportArgumentType]
+
+    for message in messages:
+        state.parse_message_create({**message})  # pyright: ignore[reportArgumentType]
+
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    await client.close()
+    return elapsed, memory
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--guilds', type=int, default=200)
+    parser.add_argument('--members', type=int, default=500, help='Members per guild')
+    parser.add_argument('--online', type=float, default=0.1, help='Share of members sent in GUILD_CREATE')
+    parser.add_argument('--messages', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)  # noqa: S311
+    online_count = max(1, int(args.members * args.online))
+
+    guilds: list[dict[str, Any]] = []
+    offline: dict[int, list[int]] = {}
+    for guild_id in range(1, args.guilds + 1):
+        member_ids = [BOT_ID, *rng.sample(range(10_000, 10_000_000), args.members - 1)]
+        guilds.append(guild_payload(guild_id, member_ids[:online_count], args.members))
+        offline[guild_id] = member_ids[online_count:]
+
+    messages = [
+        message_payload(
+            message_id,
+            guild_id := rng.randint(1, args.guilds),
+            int(rng.choice(guilds[guild_id - 1]['members'])['user']['id']),
+        )
+        for message_id in range(1, args.messages + 1)
+    ]
+
+    print(
+        f'{args.guilds} guilds x {args.members} members ({online_count} online), {args.messages} messages (seed {args.seed})'
+    )
+    print(f'{"profile":<8} | {"processing (s)":>14} | {"memory (MiB)":>12}')
+
+    for name, profile in CACHE_PROFILES.items():
+        elapsed, memory = await measure(profile, guilds, offline, messages)
+        print(f'{name:<8} | {elapsed:>14.3f} | {memory / 2**20:>12.1f}')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,167 @@
+"""
+Measure message dispatch throughput and latency under each event loop.
+
+A fixed, seeded stream of synthetic MESSAGE_CREATE payloads is parsed by the
+library's connection state and handed to Cyrene.process_commands and the Tracksy
+message listener, the same handlers on_message reaches. The stream mixes plain chat,
+commands and Anicord pulls. Commands resolve to a no-op command and database writes
+go to a stand-in which only yields to the loop, so neither network nor Postgres is measured.
+
+Run from the repository root with ``python -m benchmarks.dispatch``.
+Requires the same environment variables as the bot, since config.py is imported.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from typing import TYPE_CHECKING, Any
+
+import aiohttp
+import discord
+
+from benchmarks.cache_profiles import BOT_ID, guild_payload, message_payload, user_payload
+from config import DEFAULT_PREFIX
+from extensions.tracksy.constants import ANICORD_DISCORD_BOT, ANICORD_GACHA_SERVER
+from utilities.bases.bot import Cyrene
+from utilities.event_loop import EVENT_LOOPS, loop_factory
+
+if TYPE_CHECKING:
+    from utilities.bases.context import CyContext
+
+MEMBERS = 500
+RARITIES = ('RedStar', 'GreenStar', 'YellowStar', 'PurpleStar', 'RainbowStar', 'BlackStar')
+
+
+class StandInDatabase:
+    def __init__(self) -> None:
+        self.writes = 0
+
+    async def execute(self, *_: object, **__: object) -> str:
+        self.writes += 1
+        await asyncio.sleep(0)  # A real query would yield to the loop while waiting on the network
+        return 'INSERT 0 1'
+
+
+def pull_payload(message_id: int, user_id: int, rng: random.Random) -> dict[str, Any]:
+    data = message_payload(message_id, ANICORD_GACHA_SERVER, ANICORD_DISCORD_BOT)
+    data['author'] = {**user_payload(ANICORD_DISCORD_BOT), 'bot': True}
+    data['content'] = ''
+
+    if rng.random() < 0.5:
+        data['content'] = f'<@{user_id}> pulled a card!'
+        data['embeds'] = [
+            {
+                'title': f'Card {message_id}',
+                'description': (
+                    f'Rarity: <:{rng.choice(RARITIES)}:1259718293410021446>\nBurn Worth: 10\nID: {rng.randint(1, 99999)}'
+                ),
+            }
+        ]
+    else:
+        lines = [
+            f'Name: `Card {i}` Rarity: <:{rng.choice(RARITIES)}:1259718293410021446> | ID: `{rng.randint(1, 99999)}`'
+            for i in range(10)
+        ]
+        data['embeds'] = [{'title': 'Cards pulled', 'description': '\n'.join([f'<@{user_id}> pulled:', *lines])}]
+
+    return data
+
+
+def traffic(count: int, member_ids: list[int], seed: int) -> list[dict[str, Any]]:
+    rng = random.Random(seed)  # noqa: S311
+    messages: list[dict[str, Any]] = []
+
+    for message_id in range(1, count + 1):
+        roll = rng.random()
+        author = rng.choice(member_ids[1:])
+
+        if roll < 0.1:
+            messages.append(pull_payload(message_id, author, rng))
+            continue
+
+        data = message_payload(message_id, ANICORD_GACHA_SERVER, author)
+        data['content'] = f'{DEFAULT_PREFIX}noop' if roll < 0.3 else 'just a regular message in chat'
+        messages.append(data)
+
+    return messages
+
+
+async def measure(messages: list[dict[str, Any]], member_ids: list[int], burst: int) -> tuple[float, list[float], int]:
+    async with aiohttp.ClientSession() as session:
+        bot = Cyrene(
+            command_prefix=lambda bot, message: [bot.get_prefix_matcher(message.guild).match(message.content) or ' '],
+            extensions=[],
+            intents=discord.Intents.all(),
+            allowed_mentions=discord.AllowedMentions.none(),
+            session=session,
+        )
+        bot.db = StandInDatabase()  # pyright: ignore[reportAttributeAccessIssue]
+
+        @bot.command(name='noop')
+        async def noop(_: CyContext) -> None: ...
+
+        state = bot._connection
+        state.user = discord.ClientUser(state=state, data=user_payload(BOT_ID))  # pyright: ignore[reportArgumentType]
+        state._add_guild_from_data(guild_payload(ANICORD_GACHA_SERVER, member_ids, len(member_ids)))  # pyright: ignore[reportArgumentType]
+
+        await bot.load_extension('extensions.tracksy')
+        tracker = bot.get_cog('Tracksy')
+
+        latencies: list[float] = []
+
+        async def handle(message: discord.Message, received: float) -> None:
+            await asyncio.gather(bot.process_commands(message), tracker.message_listener(message))  # pyright: ignore[reportOptionalMemberAccess,reportAttributeAccessIssue]
+            latencies.append(time.perf_counter() - received)
+
+        start = time.perf_counter()
+
+        for index in range(0, len(messages), burst):
+            tasks: list[asyncio.Task[None]] = []
+            for data in messages[index : index + burst]:
+                received = time.perf_counter()
+                message = discord.Message(state=state, channel=state._get_guild_channel(data)[0], data={**data})  # pyright: ignore[reportArgumentType]
+                tasks.append(asyncio.create_task(handle(message, received)))
+            await asyncio.gather(*tasks)
+
+        elapsed = time.perf_counter() - start
+
+        # Drains the tracker's queued writes
+        await bot.unload_extension('extensions.tracksy')
+    # The bot never logged in, so there's no gateway for close to shut down
+    return elapsed, latencies, bot.db.writes  # pyright: ignore[reportAttributeAccessIssue]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--messages', type=int, default=20_000)
+    parser.add_argument('--burst', type=int, default=100, help='Messages in flight at once')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    member_ids = [BOT_ID, *range(10_000, 10_000 + MEMBERS)]
+    messages = traffic(args.messages, member_ids, args.seed)
+
+    print(f'{args.messages} messages in bursts of {args.burst} (seed {args.seed})')
+    print(f'{"loop":<8} | {"msgs/s":>10} | {"p50 (ms)":>9} | {"p99 (ms)":>9} | {"writes":>7}')
+
+    for name in EVENT_LOOPS:
+        factory = loop_factory(name)
+        if name != 'asyncio' and factory is None:
+            print(f'{name:<8} | not installed')
+            continue
+
+        elapsed, latencies, writes = asyncio.run(measure(messages, member_ids, args.burst), loop_factory=factory)
+        quantiles = statistics.quantiles(latencies, n=100)
+        row = (
+            f'{name:<8} | {len(latencies) / elapsed:>10.0f} | {quantiles[49] * 1000:>9.3f} | '
+            f'{quantiles[98] * 1000:>9.3f} | {writes:>7}'
+        )
+        print(row)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+"""
+Measure loading extensions one by one and concurrently along their DEPENDENCIES.
+
+A synthetic package of extensions is written to a temporary directory. Each one sleeps
+in its setup and cog_load like an extension waiting on the network, and checks that
+the extensions it declares as dependencies are loaded before it. The extensions are
+loaded in dependency order one by one, then by Cyrene.load_extensions, which logs its
+timing table. Nothing is sent to Discord and the bot never logs in.
+
+Run from the repository root with ``python -m benchmarks.extension_loading``.
+Requires the same environment variables as the bot, since config.py is imported.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import graphlib
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import aiohttp
+import discord
+
+from utilities.bases.bot import Cyrene
+
+PACKAGE = 'synthetic'
+
+# The dependencies of each synthetic extension
+GRAPH = {
+    'database': (),
+    'cache': ('database',),
+    'tracker': ('database',),
+    'frontend': ('database', 'cache'),
+    'meta': (),
+    'utility': (),
+}
+
+EXTENSION = """
+import asyncio
+
+from discord.ext import commands
+
+DEPENDENCIES = {dependencies!r}
+
+
+class Extension(commands.Cog, name={name!r}):
+    async def cog_load(self) -> None:
+        await asyncio.sleep({delay})
+
+
+async def setup(bot) -> None:
+    missing = [_ for _ in DEPENDENCIES if _ not in bot.extensions]
+    if missing:
+        raise RuntimeError(f'{{missing}} are not loaded yet')
+
+    await asyncio.sleep({delay})
+    await bot.add_cog(Extension())
+"""
+
+
+def write_package(root: Path, delay: float) -> list[str]:
+    package = root / PACKAGE
+    package.mkdir()
+    (package / '__init__.py').touch()
+
+    for name, dependencies in GRAPH.items():
+        source = EXTENSION.format(
+            name=name,
+            dependencies=tuple(f'{PACKAGE}.{_}' for _ in dependencies),
+            delay=delay,
+        )
+        (package / f'{name}.py').write_text(source, encoding='utf-8')
+
+    return [f'{PACKAGE}.{name}' for name in GRAPH]
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--delay', type=float, default=0.05, help='Seconds each setup and cog_load sleeps for')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    with tempfile.TemporaryDirectory() as directory:
+        extensions = write_package(Path(directory), args.delay)
+        sys.path.insert(0, directory)
+
+        async with aiohttp.ClientSession() as session:
+            bot = Cyrene(
+                command_prefix='!',
+                extensions=extensions,
+                intents=discord.Intents.none(),
+                allowed_mentions=discord.AllowedMentions.none(),
+                session=session,
+            )
+
+            order = graphlib.TopologicalSorter({f'{PACKAGE}.{k}': [f'{PACKAGE}.{_}' for _ in v] for k, v in GRAPH.items()})
+            start = time.perf_counter()
+            for extension in order.static_order():
+                await bot.load_extension(extension)
+            serial = time.perf_counter() - start
+
+            await bot.unload_extensions(extensions)
+
+            start = time.perf_counter()
+            await bot.load_extensions(extensions)
+            concurrent = time.perf_counter() - start
+
+            assert all(timing.loaded for timing in bot.extension_timings.values())
+            await bot.unload_extensions(extensions)
+
+        sys.path.remove(directory)
+
+    print(f'{len(extensions)} extensions, {args.delay * 1000:.0f} ms per setup and cog_load')
+    print(f'{"method":<10} | {"wall (ms)":>9}')
+    for method, elapsed in (('serial', serial), ('graph', concurrent)):
+        print(f'{method:<10} | {elapsed * 1000:>9.1f}')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,152 @@
+"""
+Measure how many pulled cards per second each way of writing a pull inserts.
+
+Every migration is applied to a scratch schema. Pulls of each shape are then written to
+GachaPulledCards through a pool, as the tracker does when Anicord messages arrive together:
+one INSERT per card, executemany over the cards and a single unnest INSERT per pull. The tracker's
+writer batches the cards of many pulls into the same unnest INSERT, so this is its worst case.
+The table is truncated between runs, so every run starts from the same state.
+
+Run from the repository root with ``python -m benchmarks.gacha_inserts``.
+Requires a Postgres the bot's user can create schemas in, POSTGRES_URI is used by default.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from typing import TYPE_CHECKING
+
+import asyncpg
+
+from config import DATABASE_CRED
+from extensions.tracksy.types import PartialCard, PullType
+from utilities.database import QUERIES
+from utilities.migrations import load_migrations
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+SCHEMA = 'gacha_benchmark'
+
+# The tracker only writes through gacha_pulls.insert_batch, so the single row INSERT lives here
+INSERT = """
+    INSERT INTO GachaPulledCards (channel_id, message_id, user_id, card_id, card_name, rarity, pull_source)
+    VALUES ($1, $2, $3, $4, $5, $6, $7)
+"""
+
+# The cards in each shape of pull
+SHAPES = {
+    'single pull': (PullType.SINGLE_PULL, 1),
+    'pullall': (PullType.PULLALL, 10),
+    '10-card pack': (PullType.PACK, 10),
+}
+
+type Pull = tuple[int, PullType, list[PartialCard]]
+type Method = Callable[[asyncpg.Pool[asyncpg.Record], Pull], Awaitable[None]]
+
+
+def make_pulls(count: int, pull_type: PullType, cards: int, rng: random.Random) -> list[Pull]:
+    return [
+        (
+            message_id,
+            pull_type,
+            [PartialCard(rng.randint(1, 99_999), f'Card {index}', rng.randint(1, 7)) for index in range(cards)],
+        )
+        for message_id in range(1, count + 1)
+    ]
+
+
+async def per_row(pool: asyncpg.Pool[asyncpg.Record], pull: Pull) -> None:
+    message_id, pull_type, cards = pull
+    for card in cards:
+        await pool.execute(INSERT, 1, message_id, 1, card.id, card.name, card.rarity, pull_type)
+
+
+async def executemany(pool: asyncpg.Pool[asyncpg.Record], pull: Pull) -> None:
+    message_id, pull_type, cards = pull
+    await pool.executemany(
+        INSERT,
+        [(1, message_id, 1, card.id, card.name, card.rarity, pull_type) for card in cards],
+    )
+
+
+async def unnest(pool: asyncpg.Pool[asyncpg.Record], pull: Pull) -> None:
+    message_id, pull_type, cards = pull
+    await pool.execute(
+        QUERIES['gacha_pulls.insert_batch'],
+        [1] * len(cards),
+        [message_id] * len(cards),
+        [1] * len(cards),
+        [card.id for card in cards],
+        [card.name for card in cards],
+        [card.rarity for card in cards],
+        [pull_type] * len(cards),
+    )
+
+
+METHODS: dict[str, Method] = {
+    'per row': per_row,
+    'executemany': executemany,
+    'unnest': unnest,
+}
+
+
+async def measure(pool: asyncpg.Pool[asyncpg.Record], method: Method, pulls: list[Pull]) -> float:
+    await pool.execute("""TRUNCATE GachaPulledCards""")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(method(pool, pull) for pull in pulls))
+    elapsed = time.perf_counter() - start
+
+    rows = await pool.fetchval("""SELECT count(*) FROM GachaPulledCards""")
+    assert rows == sum(len(cards) for _, _, cards in pulls)
+    return rows / elapsed
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--dsn', default=DATABASE_CRED)
+    parser.add_argument('--pulls', type=int, default=2000, help='Pulls written per run')
+    parser.add_argument('--pool-size', type=int, default=10)
+    parser.add_argument('--runs', type=int, default=5, help='Runs per shape and method, the median is kept')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)  # noqa: S311
+
+    connection = await asyncpg.connect(args.dsn)
+    try:
+        await connection.execute(f'DROP SCHEMA IF EXISTS {SCHEMA} CASCADE; CREATE SCHEMA {SCHEMA}')
+        await connection.execute(f'SET search_path TO {SCHEMA}')
+        for migration in load_migrations():
+            await connection.execute(migration.sql)
+
+        pool = await asyncpg.create_pool(
+            args.dsn,
+            min_size=args.pool_size,
+            max_size=args.pool_size,
+            server_settings={'search_path': SCHEMA},
+        )
+
+        print(f'{args.pulls} pulls per run, pool of {args.pool_size}, median of {args.runs} runs')
+        print(f'{"shape":<12} | {"method":<11} | {"rows/s":>10}')
+
+        try:
+            for shape, (pull_type, cards) in SHAPES.items():
+                pulls = make_pulls(args.pulls, pull_type, cards, rng)
+                for name, method in METHODS.items():
+                    rates = [await measure(pool, method, pulls) for _ in range(args.runs)]
+                    print(f'{shape:<12} | {name:<11} | {statistics.median(rates):>10.0f}')
+        finally:
+            await pool.close()
+    finally:
+        await connection.execute(f'DROP SCHEMA IF EXISTS {SCHEMA} CASCADE')
+        await connection.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
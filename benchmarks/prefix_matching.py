@@ -0,0 +1,57 @@
+"""
+Benchmark prefix resolution against the old permutation expansion.
+
+Run from the repository root with ``python -m benchmarks.prefix_matching``.
+"""
+
+from __future__ import annotations
+
+import itertools
+import timeit
+
+from utilities.prefixes import PrefixMatcher
+
+PREFIXES = {
+    1: '!',
+    5: 'cyrn!',
+    12: 'cyrene-bot!!',
+}
+NUMBER = 2_000
+
+
+def permutation_prefixes(prefixes: list[str]) -> list[str]:
+    # Behaviour of Cyrene.get_prefixes before the matcher was introduced
+    expanded: list[str] = []
+    for entry in prefixes:
+        char_options = [(c.lower(), c.upper()) for c in entry]
+        expanded.extend([''.join(combo) for combo in itertools.product(*char_options)])
+    return expanded
+
+
+def main() -> None:
+    print(f'{"length":>6} | {"case":<8} | {"permutations (us)":>17} | {"matcher (us)":>12} | {"speedup":>8}')
+
+    for length, prefix in PREFIXES.items():
+        matcher = PrefixMatcher([prefix])
+
+        for case, content in (
+            ('hit', prefix.upper() + 'help waifu'),
+            ('miss', 'just a regular message in chat'),
+        ):
+
+            def old(content: str = content, prefix: str = prefix) -> bool:
+                return content.startswith(tuple(permutation_prefixes([prefix])))
+
+            def new(content: str = content, matcher: PrefixMatcher = matcher) -> bool:
+                return matcher.match(content) is not None
+
+            assert old() is new()
+
+            old_time = timeit.timeit(old, number=NUMBER) / NUMBER * 1e6
+            new_time = timeit.timeit(new, number=NUMBER) / NUMBER * 1e6
+
+            print(f'{length:>6} | {case:<8} | {old_time:>17.3f} | {new_time:>12.3f} | {old_time / new_time:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
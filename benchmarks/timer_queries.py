@@ -0,0 +1,150 @@
+"""
+Record EXPLAIN ANALYZE timings of every timer statement before and after the timer indexes.
+
+Every migration except the one adding the timer indexes is applied to a scratch schema.
+The Timers table is then seeded with random timers, a tenth of them recurring, and every
+``timers.*`` statement in utilities/database.py is explained. The index migration is applied and
+everything is explained again. Statements which write are explained inside a
+transaction which is rolled back, so every run sees the same rows.
+
+Run from the repository root with ``python -m benchmarks.timer_queries``.
+Requires a Postgres the bot's user can create schemas in, POSTGRES_URI is used by default.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import datetime
+import json
+import statistics
+from pathlib import Path
+from typing import Any
+
+import asyncpg
+
+from config import DATABASE_CRED
+from utilities.database import QUERIES
+from utilities.migrations import load_migrations
+
+SCHEMA = 'timer_benchmark'
+INDEX_MIGRATION = 3
+USERS = 100_000
+
+
+def sample_arguments(user_id: int, timer_ids: list[int]) -> dict[str, tuple[object, ...]]:
+    # Every timers.* statement in QUERIES and the arguments it is explained with
+    now = datetime.datetime.now(tz=datetime.UTC)
+
+    return {
+        'timers.within': (now + datetime.timedelta(days=40),),
+        'timers.find': (None, user_id, 1),
+        'timers.insert': (user_id, now + datetime.timedelta(days=1), 1, None, None),
+        'timers.claim': (now, 'benchmark', datetime.timedelta(minutes=5), 500),
+        'timers.complete': (timer_ids, 'benchmark', now),
+        'timers.cancel': (None, user_id, 1),
+        'timers.cancel_many': (timer_ids,),
+    }
+
+
+def scan_nodes(plan: dict[str, Any]) -> list[str]:
+    nodes: list[str] = []
+    if plan.get('Relation Name') == 'timers':
+        nodes.append(plan['Node Type'])
+    for child in plan.get('Plans', []):
+        nodes.extend(scan_nodes(child))
+    return nodes
+
+
+async def explain(connection: asyncpg.Connection, sql: str, args: tuple[object, ...], runs: int) -> tuple[float, str]:
+    timings: list[float] = []
+    nodes: list[str] = []
+
+    for _ in range(runs):
+        transaction = connection.transaction()
+        await transaction.start()
+        try:
+            raw = await connection.fetchval(f'EXPLAIN (ANALYZE, FORMAT JSON) {sql}', *args)
+        finally:
+            await transaction.rollback()
+
+        report = json.loads(raw)[0]
+        timings.append(report['Execution Time'])
+        nodes = scan_nodes(report['Plan'])
+
+    return statistics.median(timings), ', '.join(nodes) or '-'
+
+
+async def explain_all(connection: asyncpg.Connection, runs: int) -> dict[str, tuple[float, str]]:
+    user_id = await connection.fetchval("""SELECT user_id FROM Timers ORDER BY random() LIMIT 1""")
+    timer_ids = await connection.fetchval(
+        """SELECT array_agg(id) FROM (SELECT id FROM Timers WHERE expires <= CURRENT_TIMESTAMP LIMIT 500) AS due"""
+    )
+    await connection.execute("""UPDATE Timers SET leased_by = 'benchmark' WHERE id = ANY($1::integer[])""", timer_ids)
+
+    return {
+        name: await explain(connection, QUERIES[name], arguments, runs)
+        for name, arguments in sample_arguments(user_id, timer_ids).items()
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--dsn', default=DATABASE_CRED)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--runs', type=int, default=5, help='EXPLAIN ANALYZE runs per statement, the median is kept')
+    parser.add_argument('--seed', type=float, default=0.5, help='Seed of Postgres random(), between -1 and 1')
+    parser.add_argument('--output', type=Path, help='Also write the results to this JSON file')
+    args = parser.parse_args()
+
+    migrations = load_migrations()
+    connection = await asyncpg.connect(args.dsn)
+
+    try:
+        await connection.execute(f'DROP SCHEMA IF EXISTS {SCHEMA} CASCADE; CREATE SCHEMA {SCHEMA}')
+        await connection.execute(f'SET search_path TO {SCHEMA}')
+
+        for migration in migrations:
+            if migration.version != INDEX_MIGRATION:
+                await connection.execute(migration.sql)
+
+        await connection.execute("""SELECT setseed($1)""", args.seed)
+        await connection.execute(
+            """
+            INSERT INTO Timers (user_id, reserved_type, expires, data, recurrence)
+            SELECT
+                (random() * $2)::bigint,
+                CASE WHEN random() < 0.8 THEN 1 END,
+                CURRENT_TIMESTAMP + random() * INTERVAL '365 days' - INTERVAL '30 days',
+                NULL,
+                CASE WHEN random() < 0.1 THEN INTERVAL '1 day' END
+            FROM generate_series(1, $1)
+            """,
+            args.rows,
+            USERS,
+        )
+        await connection.execute("""ANALYZE Timers""")
+        before = await explain_all(connection, args.runs)
+
+        for migration in migrations:
+            if migration.version == INDEX_MIGRATION:
+                await connection.execute(migration.sql)
+        await connection.execute("""ANALYZE Timers""")
+        after = await explain_all(connection, args.runs)
+    finally:
+        await connection.execute(f'DROP SCHEMA IF EXISTS {SCHEMA} CASCADE')
+        await connection.close()
+
+    print(f'{args.rows} timers, {USERS} users, median of {args.runs} runs')
+    print(f'{"statement":<18} | {"before (ms)":>11} | {"after (ms)":>10} | {"before scan":<16} | {"after scan":<16}')
+    for name, (before_time, before_scan) in before.items():
+        after_time, after_scan = after[name]
+        print(f'{name:<18} | {before_time:>11.3f} | {after_time:>10.3f} | {before_scan:<16} | {after_scan:<16}')
+
+    if args.output:
+        results = {name: {'before': before[name], 'after': after[name]} for name in before}
+        args.output.write_text(json.dumps(results, indent=4), encoding='utf-8')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
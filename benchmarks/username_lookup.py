@@ -0,0 +1,76 @@
+"""
+Measure resolving pack authors by username with a scan of the user cache and with the index.
+
+A seeded set of synthetic users is stored in the library's connection state, the same cache
+Cyrene.users reads. Every lookup is a cached username, the common case for packs, so the
+gateway fallback on a miss is not measured.
+
+Run from the repository root with ``python -m benchmarks.username_lookup``.
+Requires the same environment variables as the bot, since config.py is imported.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import time
+
+import discord
+
+from benchmarks.cache_profiles import BOT_ID, user_payload
+from extensions.tracksy.usernames import UsernameIndex
+
+
+def scan(client: discord.Client, name: str) -> discord.User | None:
+    # How the tracker resolved pack authors before the index
+    user = [_ for _ in client.users if _.name == name]
+    return user[0] if user else None
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--users', type=int, default=100_000)
+    parser.add_argument('--lookups', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)  # noqa: S311
+
+    client = discord.Client(intents=discord.Intents.all())
+    state = client._connection
+    state.user = discord.ClientUser(state=state, data=user_payload(BOT_ID))  # pyright: ignore[reportArgumentType]
+
+    # The cache only holds users weakly, in the bot the members hold them
+    user_ids = rng.sample(range(10_000, 10_000_000), args.users)
+    users = [state.store_user(user_payload(user_id)) for user_id in user_ids]  # pyright: ignore[reportArgumentType]
+
+    names = [f'user{rng.choice(user_ids)}' for _ in range(args.lookups)]
+
+    index = UsernameIndex(client)
+    start = time.perf_counter()
+    index.rebuild()
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scanned = [scan(client, name) for name in names]
+    scan_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    indexed = [index.get(name) for name in names]
+    index_time = time.perf_counter() - start
+
+    assert scanned == indexed
+    assert None not in indexed
+    assert len(client.users) == len(users)
+
+    print(f'{args.users} cached users, {args.lookups} lookups (seed {args.seed}), index built in {build * 1000:.1f} ms')
+    print(f'{"method":<6} | {"per lookup (us)":>15} | {"lookups/s":>12}')
+    for method, elapsed in (('scan', scan_time), ('index', index_time)):
+        print(f'{method:<6} | {elapsed / args.lookups * 1e6:>15.3f} | {args.lookups / elapsed:>12.0f}')
+
+    await client.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -1,6 +1,7 @@
 import json
 from os import getenv
 
+import discord
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -15,3 +16,75 @@ DEFAULT_PREFIX: str = getenv('DEFAULT_PREFIX')
 OWNER_IDS: list[int] = json.loads(getenv('OWNER_IDS'))
 
 DATABASE_CRED: str = getenv('POSTGRES_URI')
+
+# Connection pool tuning. Set the statement cache size to 0 behind a transaction pooler such as pgbouncer.
+DATABASE_POOL_MIN_SIZE: int = int(getenv('DATABASE_POOL_MIN_SIZE', '2'))
+DATABASE_POOL_MAX_SIZE: int = int(getenv('DATABASE_POOL_MAX_SIZE', '10'))
+DATABASE_STATEMENT_CACHE_SIZE: int = int(getenv('DATABASE_STATEMENT_CACHE_SIZE', '256'))
+DATABASE_MAX_INACTIVE_CONNECTION_LIFETIME: float = float(getenv('DATABASE_MAX_INACTIVE_CONNECTION_LIFETIME', '300'))
+
+# Replay of the timers which came due while the bot was down, before normal scheduling starts.
+# The rate is timers per second, 0 for no cap. With coalescing on, timers of a reserved type overdue by
+# more than TIMER_STALE_AFTER seconds only fire once per user and type, for the latest of them.
+TIMER_CATCH_UP_CONCURRENCY: int = int(getenv('TIMER_CATCH_UP_CONCURRENCY', '5'))
+TIMER_CATCH_UP_RATE: float = float(getenv('TIMER_CATCH_UP_RATE', '10'))
+TIMER_COALESCE_STALE: bool = getenv('TIMER_COALESCE_STALE', 'true').lower() == 'true'
+TIMER_STALE_AFTER: float = float(getenv('TIMER_STALE_AFTER', '3600'))
+
+# Tracksy writes pulled cards through a bounded queue, flushed in batches by a background writer.
+# Batches which can't be written while Postgres is unreachable are appended to TRACKSY_SPILL_PATH
+# and replayed once it is back.
+TRACKSY_QUEUE_SIZE: int = int(getenv('TRACKSY_QUEUE_SIZE', '10000'))
+TRACKSY_BATCH_SIZE: int = int(getenv('TRACKSY_BATCH_SIZE', '500'))
+TRACKSY_FLUSH_INTERVAL: float = float(getenv('TRACKSY_FLUSH_INTERVAL', '1'))
+TRACKSY_SPILL_PATH: str = getenv('TRACKSY_SPILL_PATH', 'tracksy-spill.jsonl')
+
+# The event loop the bot runs on, asyncio or uvloop. uvloop falls back to asyncio when it isn't installed.
+EVENT_LOOP: str = getenv('EVENT_LOOP', 'uvloop')
+
+# Cache profiles decide how much of Discord's state is held in memory.
+# full:    everything the library offers, every member of every guild is cached.
+# lean:    no presences and guilds aren't chunked, on startup or when joined. Only members who join while
+#          the bot is running are cached, others are fetched when a command needs them and
+#          bot farm checks are skipped.
+# minimal: no privileged intents besides message content and no member cache.
+#          Member-only features degrade to their user fallbacks.
+CACHE_PROFILE: str = getenv('CACHE_PROFILE', 'full')
+
+CACHE_PROFILES: dict[str, dict] = {
+    'full': {
+        'intents': discord.Intents.all(),
+        'member_cache_flags': discord.MemberCacheFlags.all(),
+        'chunk_guilds_at_startup': True,
+        'max_messages': 1000,
+    },
+    'lean': {
+        'intents': discord.Intents(
+            guilds=True,
+            members=True,
+            emojis_and_stickers=True,
+            webhooks=True,
+            voice_states=False,
+            guild_messages=True,
+            guild_reactions=True,
+            dm_messages=True,
+            dm_reactions=True,
+            message_content=True,
+        ),
+        'member_cache_flags': discord.MemberCacheFlags(voice=False, joined=True),
+        'chunk_guilds_at_startup': False,
+        'max_messages': 200,
+    },
+    'minimal': {
+        'intents': discord.Intents(
+            guilds=True,
+            guild_messages=True,
+            guild_reactions=True,
+            dm_messages=True,
+            message_content=True,
+        ),
+        'member_cache_flags': discord.MemberCacheFlags.none(),
+        'chunk_guilds_at_startup': False,
+        'max_messages': None,
+    },
+}
@@ -122,8 +122,8 @@ class WaifuBase(BaseView):
     ) -> discord.InteractionCallbackResponse[Cyrene] | None:
         if interaction.user in self.smashers:
             try:
-                await interaction.client.pool.execute(
-                    """INSERT INTO WaifuFavourites VALUES ($1, $2, $3, $4)""",
+                await interaction.client.db.execute(
+                    'waifu_favourites.insert',
                     self.current.image_id,
                     interaction.user.id,
                     self.nsfw,
@@ -146,20 +146,7 @@ class WaifuBase(BaseView):
             self.passers.remove(interaction.user)
 
         self.smashers.add(interaction.user)
-        await interaction.client.pool.execute(
-            """
-                INSERT INTO
-                    Waifus (id, smashes, nsfw)
-                VALUES
-                    ($1, 1, $2)
-                ON CONFLICT (id) DO
-                UPDATE
-                SET
-                    smashes = Waifus.smashes + 1
-            """,
-            self.current.image_id,
-            self.nsfw,
-        )
+        await interaction.client.db.execute('waifus.smash', self.current.image_id, self.nsfw)
         await interaction.response.edit_message(embed=self.embed(self.current))
         return None
 
@@ -170,8 +157,8 @@ class WaifuBase(BaseView):
         self, interaction: discord.Interaction[Cyrene], _: discord.ui.Button[Self]
     ) -> discord.InteractionCallbackResponse[Cyrene] | None:
         if interaction.user in self.passers:
-            results = await interaction.client.pool.fetch(
-                """DELETE FROM WaifuFavourites WHERE id = $1 AND user_id = $2 RETURNING id""",
+            results = await interaction.client.db.fetch(
+                'waifu_favourites.delete',
                 self.current.image_id,
                 interaction.user.id,
             )
@@ -187,20 +174,7 @@ class WaifuBase(BaseView):
             self.smashers.remove(interaction.user)
 
         self.passers.add(interaction.user)
-        await interaction.client.pool.execute(
-            """
-                INSERT INTO
-                    Waifus (id, passes, nsfw)
-                VALUES
-                    ($1, 1, $2)
-                ON CONFLICT (id) DO
-                UPDATE
-                SET
-                    passes = Waifus.passes + 1
-                """,
-            self.current.image_id,
-            self.nsfw,
-        )
+        await interaction.client.db.execute('waifus.pass', self.current.image_id, self.nsfw)
         await interaction.response.edit_message(embed=self.embed(self.current))
         return None
 
@@ -322,8 +296,8 @@ class RemoveFavButton(discord.ui.Button[Paginator]):
 
     async def callback(self, interaction: discord.Interaction[Cyrene]) -> None:
         item: WaifuFavouriteEntry = await self.view.source.get_page(self.view.current_page)  # pyright: ignore[reportUnknownMemberType]
-        await interaction.client.pool.execute(
-            """DELETE FROM WaifuFavourites WHERE id = $1 AND user_id = $2 RETURNING id""",
+        await interaction.client.db.execute(
+            'waifu_favourites.delete',
             item.id,  # pyright: ignore[reportUnknownMemberType]
             interaction.user.id,
         )
@@ -78,17 +78,8 @@ class Waifu(CyCog):
             else False
         )
 
-        query = """SELECT * FROM WaifuFavourites WHERE user_id = $1""" + (' AND nsfw = $2' if show_nsfw is False else '')  # noqa: S608
-        args = [
-            user.id,
-        ]
-
-        if show_nsfw is False:
-            args.append(show_nsfw)
-        fav_entries = await self.bot.pool.fetch(
-            query,
-            *args,
-        )
+        # A NULL filter matches both, so NSFW entries are only filtered out when they aren't to be shown
+        fav_entries = await self.bot.db.fetch('waifu_favourites.by_user', user.id, None if show_nsfw else False)
 
         if not fav_entries:
             await ctx.reply(
@@ -5,6 +5,7 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from utilities.bases.bot import Cyrene
     from utilities.bases.context import CyContext
+import asyncio
 import contextlib
 
 import discord
@@ -17,6 +18,14 @@ from .guild import Guild
 
 
 class Internals(Blacklist, Developer, ErrorHandler, Guild, name='Developer'):
+    async def cog_load(self) -> None:
+        # The mixins' cog_load would otherwise shadow each other through the MRO
+        await asyncio.gather(
+            Blacklist.cog_load(self),
+            ErrorHandler.cog_load(self),
+            Guild.cog_load(self),
+        )
+
     @discord.utils.copy_doc(commands.Cog.cog_check)
     async def cog_check(self, ctx: CyContext) -> bool:
         if await self.bot.is_owner(ctx.author):
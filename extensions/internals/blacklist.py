@@ -3,7 +3,7 @@ from __future__ import annotations
 import datetime
 import enum
 from dataclasses import dataclass
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 import discord
 from discord.ext import commands
@@ -44,7 +44,7 @@ class Blacklist(CyCog):
 
     async def cog_load(self) -> None:
         self.bot.blacklists = {}
-        entries = await self.bot.pool.fetch("""SELECT * FROM Blacklists""")
+        entries = await self.bot.db.fetch('blacklists.all')
 
         for entry in entries:
             self.bot.blacklists[entry['snowflake']] = BlacklistData(
@@ -300,11 +300,8 @@ class Blacklist(CyCog):
                 raise AlreadyBlacklistedError(snowflake, reason=entry.reason, until=entry.lasts_until)
         blacklist_type = BlackListType.USER if isinstance(snowflake, discord.User | discord.Member) else BlackListType.GUILD
 
-        await self.bot.pool.execute(
-            """INSERT INTO
-                    Blacklists (snowflake, reason, lasts_until, blacklist_type)
-               VALUES
-                    ($1, $2, $3, $4);""",
+        await self.bot.db.execute(
+            'blacklists.insert',
             snowflake.id,
             reason,
             lasts_until,
@@ -316,6 +313,9 @@ class Blacklist(CyCog):
             lasts_until=lasts_until,
             blacklist_type=blacklist_type,
         )
+        if self.bot.cluster:
+            await self.bot.cluster.broadcast('blacklist', {'snowflake': snowflake.id})
+
         return {snowflake.id: self.bot.blacklists[snowflake.id]}
 
     async def remove(self, snowflake: discord.User | discord.Member | discord.Guild | int) -> dict[int, BlacklistData]:
@@ -345,13 +345,28 @@ class Blacklist(CyCog):
 
         obj = snowflake if isinstance(snowflake, int) else snowflake.id
 
-        await self.bot.pool.execute(
-            """DELETE FROM Blacklists WHERE snowflake = $1""",
-            obj,
-        )
+        await self.bot.db.execute('blacklists.delete', obj)
 
         item_removed = self.bot.blacklists.pop(obj)
+        if self.bot.cluster:
+            await self.bot.cluster.broadcast('blacklist', {'snowflake': obj})
+
         return {obj: item_removed}
 
+    @commands.Cog.listener('on_cluster_blacklist')
+    async def cluster_blacklist(self, data: dict[str, Any]) -> None:
+        # Another cluster changed this entry, so it's reloaded from the database
+        entry = await self.bot.db.fetchrow('blacklists.get', data['snowflake'])
+
+        if entry is None:
+            self.bot.blacklists.pop(data['snowflake'], None)
+            return
+
+        self.bot.blacklists[entry['snowflake']] = BlacklistData(
+            reason=entry['reason'],
+            lasts_until=entry['lasts_until'],
+            blacklist_type=entry['blacklist_type'],
+        )
+
     def _timestamp_wording(self, dt: datetime.datetime | None) -> str:
         return f'until {discord.utils.format_dt(dt, "f")}' if dt else 'permanently'
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from discord.ext import commands
 
@@ -22,9 +22,60 @@ class Developer(CyCog):
         except commands.ExtensionError as error:
             return await ctx.reply(format_tb(error))
         else:
+            if self.bot.cluster:
+                await self.bot.cluster.broadcast('reload')
             return await ctx.message.add_reaction(BotEmojis.GREEN_TICK)
 
+    @commands.Cog.listener('on_cluster_reload')
+    async def cluster_reload(self, _: dict[str, Any]) -> None:
+        await self.bot.reload_extensions(self.bot.initial_extensions)
+
     @commands.command()
     async def maintenance(self, ctx: CyContext) -> None:
         self.bot.maintenance = not self.bot.maintenance
         return await ctx.message.add_reaction(BotEmojis.GREEN_TICK)
+
+    @commands.group(name='metrics', invoke_without_command=True, hidden=True)
+    async def metrics(self, ctx: CyContext) -> None:
+        await ctx.send_help(ctx.command)
+
+    @metrics.command(name='queries', description='Shows the statements the most database time was spent on')
+    async def metrics_queries(self, ctx: CyContext, limit: int = 10) -> Message:
+        hottest = self.bot.db.hottest(limit)
+        if not hottest:
+            return await ctx.reply('No statements have been run yet.')
+
+        lines = [f'{"statement":<32} {"calls":>8} {"errors":>6} {"total ms":>10} {"mean ms":>8} {"max ms":>8}']
+        lines.extend(
+            (
+                f'{name:<32} {stats.calls:>8} {stats.errors:>6} {stats.total_time * 1000:>10.1f} '
+                f'{stats.mean_time * 1000:>8.2f} {stats.max_time * 1000:>8.2f}'
+            )
+            for name, stats in hottest
+        )
+        return await ctx.reply('```\n' + '\n'.join(lines) + '\n```')
+
+    @metrics.command(name='timers', description='Shows how late timers fire and why the dispatcher restarted')
+    async def metrics_timers(self, ctx: CyContext) -> Message:
+        manager = self.bot.timer_manager
+        lateness = manager.metrics.lateness
+
+        lines = [
+            f'Queue depth: {manager.queue_depth} within {manager.HORIZON.days} days, {manager.in_flight} batches firing',
+            f'Fired: {lateness.total}, late by {lateness.mean:.3f}s on average, {lateness.max:.3f}s at most',
+            f'Estimated p50 {lateness.quantile(0.5):.3f}s, p99 {lateness.quantile(0.99):.3f}s',
+            '',
+            f'{"late by":<10} {"timers":>8}',
+        ]
+        bounds = [f'<= {bound:g}s' for bound in lateness.BOUNDS] + [f'> {lateness.BOUNDS[-1]:g}s']
+        lines.extend(f'{bound:<10} {count:>8}' for bound, count in zip(bounds, lateness.counts, strict=True))
+
+        restarts = manager.metrics.restarts
+        lines.extend(['', f'Restarts: {restarts.total()}, {manager.metrics.backoff_time:.1f}s spent backing off'])
+        lines.extend(f'{reason:<24} {count:>8}' for reason, count in restarts.most_common())
+        lines.extend(
+            f'{when:%Y-%m-%d %H:%M:%S} {detail} (after {delay:g}s)'
+            for when, detail, delay in manager.metrics.recent_restarts
+        )
+
+        return await ctx.reply('```\n' + '\n'.join(lines) + '\n```')
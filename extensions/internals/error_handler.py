@@ -15,7 +15,7 @@ from config import DEFAULT_WEBHOOK
 from utilities.bases.cog import CyCog
 from utilities.constants import ERROR_COLOUR, BotEmojis
 from utilities.embed import Embed
-from utilities.errors import CyreneError, WaifuNotFoundError
+from utilities.errors import CyreneError, PrefixAlreadyPresentError, PrefixNotPresentError, WaifuNotFoundError
 from utilities.functions import fmt_str, format_tb, get_command_signature
 from utilities.pagination import Paginator
 from utilities.view import BaseView
@@ -282,15 +282,15 @@ class ErrorView(BaseView):
 
     @discord.ui.button(label='Get notified', style=discord.ButtonStyle.green)
     async def notified_button(self, interaction: discord.Interaction[Cyrene], _: discord.ui.Button[Self]) -> None:
-        is_user_present = await interaction.client.pool.fetchrow(
-            """SELECT * FROM ErrorReminders WHERE id = $1 AND user_id = $2""",
+        is_user_present = await interaction.client.db.fetchrow(
+            'error_reminders.get',
             self.error_record['id'],
             interaction.user.id,
         )
 
         if is_user_present:
-            await interaction.client.pool.execute(
-                """DELETE FROM ErrorReminders WHERE id = $1 AND user_id = $2""",
+            await interaction.client.db.execute(
+                'error_reminders.delete',
                 self.error_record['id'],
                 interaction.user.id,
             )
@@ -300,8 +300,8 @@ class ErrorView(BaseView):
             )
             return
 
-        await interaction.client.pool.execute(
-            """INSERT INTO ErrorReminders (id, user_id) VALUES ($1, $2)""",
+        await interaction.client.db.execute(
+            'error_reminders.insert',
             self.error_record['id'],
             interaction.user.id,
         )
@@ -334,16 +334,9 @@ class ErrorHandler(CyCog):
     )
 
     async def cog_load(self) -> None:
-        if self.bot.webhooks.get('ERROR') is None:
-            await self.bot.pool.execute(
-                """
-                    INSERT INTO Webhooks
-                    VALUES ($1, $2);
-                """,
-                'ERROR',
-                DEFAULT_WEBHOOK,
-            )
-            await self.bot.refresh_vars()
+        if self.bot.webhooks.get('ERROR') is None and DEFAULT_WEBHOOK:
+            await self.bot.db.execute('webhooks.insert', 'ERROR', DEFAULT_WEBHOOK)
+            await self.bot.refresh_webhooks()
 
     def _cleanse_error_attrs(self, attrs: list[str] | str, *, seperator: str, prefix: str) -> str:
         return (
@@ -408,23 +401,8 @@ class ErrorHandler(CyCog):
         formatted_error = format_tb(error)
         time_occured = datetime.datetime.now()
 
-        record = await self.bot.pool.fetchrow(
-            """
-                INSERT INTO
-                    Errors (
-                        command,
-                        user_id,
-                        guild,
-                        error,
-                        full_error,
-                        message_url,
-                        occured_when,
-                        fixed
-                    )
-                VALUES
-                    ($1, $2, $3, $4, $5, $6, $7, $8)
-                RETURNING *
-        """,
+        record = await self.bot.db.fetchrow(
+            'errors.insert',
             name,
             author.id,
             guild.id if guild else None,
@@ -450,21 +428,7 @@ class ErrorHandler(CyCog):
         *,
         command_name: str,
     ) -> Record | None:
-        return await self.bot.pool.fetchrow(
-            """
-                SELECT
-                    *
-                FROM
-                    Errors
-                WHERE
-                    command = $1
-                    AND error = $2
-                    AND fixed = $3
-            """,
-            command_name,
-            str(error),
-            False,
-        )
+        return await self.bot.db.fetchrow('errors.find_unfixed', command_name, str(error))
 
     @commands.Cog.listener('on_command_error')
     async def error_handler(self, ctx: CyContext, error: commands.CommandError) -> None | discord.Message:
@@ -614,6 +578,12 @@ class ErrorHandler(CyCog):
                     '-# You can only search for a **character** or **franchise/series**.'
                 )
             )
+
+        if isinstance(error, PrefixAlreadyPresentError):
+            return await ctx.reply(f'`{error.prefix}` is already a prefix in this server.')
+
+        if isinstance(error, PrefixNotPresentError):
+            return await ctx.reply(f'`{error.prefix}` is not a prefix in this server.')
         return None
 
     @commands.group(
@@ -627,27 +597,25 @@ class ErrorHandler(CyCog):
     @errorcmd_base.command(name='show', description='Shows the embed for a certain error')
     async def error_show(self, ctx: CyContext, error_id: int | None = None) -> None:
         if error_id:
-            error_record = await self.bot.pool.fetchrow("""SELECT * FROM Errors WHERE id = $1""", error_id)
+            error_record = await self.bot.db.fetchrow('errors.get', error_id)
             if not error_record:
                 await ctx.reply('Error not found.')
                 return
             embed = await Embed.logger(self.bot, error_record)
             await ctx.reply(embed=embed)
             return
-        errors = await self.bot.pool.fetch(
-            """SELECT * FROM Errors""",
-        )
+        errors = await self.bot.db.fetch('errors.all')
         paginate = Paginator(ErrorPageSource(self.bot, errors), ctx=ctx)
         await paginate.start()
 
     @errorcmd_base.command(name='fix', description='Mark an error as fixed')
     async def error_fix(self, ctx: CyContext, error_id: int) -> None:
-        data = await self.bot.pool.fetchrow("""SELECT * FROM Errors WHERE id = $1""", error_id)
+        data = await self.bot.db.fetchrow('errors.get', error_id)
         if not data:
             await ctx.reply(f'Cannot find an error with the ID: `{error_id}`')
             return
-        await self.bot.pool.execute("""UPDATE Errors SET fixed = $1 WHERE id = $2""", True, error_id)
-        notifiers = await self.bot.pool.fetch("""SELECT user_id FROM ErrorReminders WHERE id = $1""", error_id)
+        await self.bot.db.execute('errors.set_fixed', True, error_id)
+        notifiers = await self.bot.db.fetch('error_reminders.by_error', error_id)
         if notifiers:
             users = [_ for _ in [self.bot.get_user(user['user_id']) for user in notifiers] if _]
             for user in users:
@@ -656,5 +624,5 @@ class ErrorHandler(CyCog):
                 except discord.errors.Forbidden:
                     continue
             # Assuming all goes fine
-            await self.bot.pool.execute("""DELETE FROM ErrorReminders WHERE id = $1""", error_id)
+            await self.bot.db.execute('error_reminders.delete_by_error', error_id)
         await ctx.message.add_reaction(BotEmojis.GREEN_TICK)
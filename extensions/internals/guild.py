@@ -21,6 +21,9 @@ BOT_FARM_COLOUR = discord.Colour.from_str('#fff5e8')
 
 
 def bot_farm_check(guild: discord.Guild) -> bool:
+    if not guild.chunked:
+        return False  # Without every member, the bot itself would make up most of the ones known
+
     bots = len([_ for _ in guild.members if _.bot is True])
     members = len(guild.members)
     return (bots / members) * 100 > BOT_FARM_THRESHOLD
@@ -63,19 +66,13 @@ def find_base_channel(channels: Sequence[discord.abc.GuildChannel]) -> discord.a
 
 class Guild(CyCog):
     async def cog_load(self) -> None:
-        if self.bot.webhooks.get('GUILD') is None:
-            await self.bot.pool.execute(
-                """
-                    INSERT INTO Webhooks
-                    VALUES ($1, $2);
-                """,
-                'GUILD',
-                DEFAULT_WEBHOOK,
-            )
-            await self.bot.refresh_vars()
+        if self.bot.webhooks.get('GUILD') is None and DEFAULT_WEBHOOK:
+            await self.bot.db.execute('webhooks.insert', 'GUILD', DEFAULT_WEBHOOK)
+            await self.bot.refresh_webhooks()
 
     @commands.Cog.listener('on_guild_join')
     async def guild_join(self, guild: discord.Guild) -> None:
+        # The library chunks joined guilds before this when the cache profile chunks at startup
         is_blacklisted = self.bot.is_blacklisted(guild)
         is_bot_farm = bot_farm_check(guild)
 
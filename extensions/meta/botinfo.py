@@ -65,24 +65,30 @@ class BotInformation(CyCog):
             icon_url=bot.owner.display_avatar.url,
         )
 
-        proc = psutil.Process()
-        with proc.oneshot():
-            memory = proc.memory_info().rss
-            memory_usage = natural_size(memory)
+        stats = await bot.cluster_statistics()
+
+        memory_usage = natural_size(stats['memory'])
+        memory_percent = stats['memory'] / psutil.virtual_memory().total * 100
 
         embed.add_field(
             name='Internal Statistics',
             value=fmt_str(
                 [
-                    f'- **Servers :** `{len(bot.guilds)}`',
-                    f'- **Users :** `{len(bot.users)}` (`{len([_ for _ in bot.users if _.bot is True])} bots`)',
+                    f'- **Servers :** `{stats["guilds"]}`',
+                    (
+                        # Users in guilds of several clusters are counted once per cluster
+                        f'- **Users :** `{stats["users"]}` (`{stats["bots"]} bots`, summed per cluster)'
+                        if bot.cluster
+                        else f'- **Users :** `{stats["users"]}` (`{stats["bots"]} bots`)'
+                    ),
                     (
                         f'  - **Installed by :** {self.bot.appinfo.approximate_user_install_count} users'
                         if self.bot.appinfo.approximate_user_install_count
                         else None
                     ),
                     f'- **Uptime since:** {timestamp_str(bot.start_time, with_time=True)}',
-                    f'- **Memory :** `{memory_usage}` (`{round(proc.memory_percent(), 2)}%`)',
+                    f'- **Memory :** `{memory_usage}` (`{round(memory_percent, 2)}%`)',
+                    f'- **Clusters :** `{bot.cluster.cluster_count}`' if bot.cluster else None,
                 ],
                 seperator='\n',
             ),
@@ -174,23 +174,7 @@ class Frontend(CyCog):
         ctx: CyContext,
         user: discord.User | discord.Member = commands.Author,
     ) -> None:
-        pull_records = await self.bot.pool.fetch(
-            """
-            SELECT
-                channel_id,
-                message_id,
-                user_id,
-                card_id,
-                card_name,
-                rarity,
-                pull_source
-            FROM
-                GachaPulledCards
-            WHERE
-                user_id = $1
-            """,
-            user.id,
-        )
+        pull_records = await self.bot.db.fetch('gacha_pulls.by_user', user.id)
         if not pull_records:
             raise commands.BadArgument("You don't have any pulls syncronised with me.")
 
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import logging
+from typing import TYPE_CHECKING, Any
+
+from extensions.tracksy.parser import parse_pack_page
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Coroutine
+
+    import discord
+    from discord import RawMessageUpdateEvent
+
+    from extensions.tracksy.parser import ParsedPull
+    from extensions.tracksy.types import PartialCard
+
+
+__all__ = (
+    'PackSession',
+    'PackSessions',
+)
+
+log = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass
+class PackSession:
+    message: discord.Message
+    user: discord.User | discord.Member
+    pages: int
+    cards: dict[int, PartialCard]
+    expiry: asyncio.TimerHandle | None = None
+
+
+class PackSessions:
+    """
+    Tracks the paged packs being flipped through, by the ID of their message.
+
+    Every message edit is handed to update, which is a single dict lookup for messages
+    which aren't open packs. A pack is committed once its last page is seen, or with the
+    pages seen so far once it hasn't been flipped for TIMEOUT seconds.
+    """
+
+    TIMEOUT = 60.0
+
+    def __init__(self, commit: Callable[[PackSession], Coroutine[Any, Any, None]]) -> None:
+        self._commit = commit
+        self._sessions: dict[int, PackSession] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+
+        super().__init__()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def open(self, message: discord.Message, user: discord.User | discord.Member, parsed: ParsedPull) -> None:
+        """
+        Start tracking a pack from its first page.
+
+        Parameters
+        ----------
+        message : discord.Message
+            The message of the pack
+        user : discord.User | discord.Member
+            The user who opened the pack
+        parsed : ParsedPull
+            The pack as parsed from its first page
+
+        """
+        session = PackSession(message, user, parsed.pages, {1: parsed.cards[0]})
+        self._sessions[message.id] = session
+        self._reset_expiry(session)
+
+    def update(self, payload: RawMessageUpdateEvent) -> None:
+        """
+        Add the page an edit flipped to to its pack.
+
+        Parameters
+        ----------
+        payload : RawMessageUpdateEvent
+            The edit of any message
+
+        """
+        session = self._sessions.get(payload.message_id)
+        if session is None:
+            return
+
+        page = parse_pack_page(payload.message.embeds[0]) if payload.message.embeds else None
+        if page is None:
+            self._finish(payload.message_id)  # No longer shows a page we can read
+            return
+
+        session.cards[page.page] = page.card
+
+        if page.page == session.pages:
+            self._finish(payload.message_id)
+        else:
+            self._reset_expiry(session)
+
+    def _reset_expiry(self, session: PackSession) -> None:
+        if session.expiry is not None:
+            session.expiry.cancel()
+
+        loop = asyncio.get_running_loop()
+        session.expiry = loop.call_later(self.TIMEOUT, self._finish, session.message.id)
+
+    def _finish(self, message_id: int) -> None:
+        session = self._sessions.pop(message_id, None)
+        if session is None:
+            return
+
+        if session.expiry is not None:
+            session.expiry.cancel()
+
+        task = asyncio.create_task(self._commit(session))
+        self._tasks.add(task)
+        task.add_done_callback(self._on_committed)
+
+    def _on_committed(self, task: asyncio.Task[None]) -> None:
+        self._tasks.discard(task)
+
+        if not task.cancelled() and (error := task.exception()):
+            log.error('Could not commit a pack', exc_info=error)
+
+    async def close(self) -> None:
+        """Commit every open pack with the pages seen so far."""
+        for message_id in tuple(self._sessions):
+            self._finish(message_id)
+
+        await asyncio.gather(*self._tasks, return_exceptions=True)
@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import logging
+import re
+from types import MappingProxyType
+from typing import TYPE_CHECKING, NamedTuple
+
+from extensions.tracksy.constants import (
+    PACK_LIST_PULL_REGEX,
+    PACK_LIST_PULL_TITLE_REGEX,
+    PACK_PAGE_PULL_REGEX,
+    PULLALL_LINE_REGEX,
+    RARITY_EMOJIS,
+    SINGLE_PULL_REGEX,
+    WEEKLY_PULL_REGEX,
+)
+from extensions.tracksy.types import PackPullView, PartialCard, PullType
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    import discord
+
+
+__all__ = (
+    'PARSERS',
+    'RARITIES',
+    'PackPage',
+    'ParsedPull',
+    'parse_message',
+    'parse_pack_page',
+    'pull_shape',
+)
+
+log = logging.getLogger(__name__)
+
+MENTION = re.compile(r'<@!?([0-9]+)>')
+PULLALL_LINE = re.compile(PULLALL_LINE_REGEX)
+SINGLE_PULL = re.compile(SINGLE_PULL_REGEX)
+WEEKLY_PULL = re.compile(WEEKLY_PULL_REGEX)
+PACK_PAGE_PULL = re.compile(PACK_PAGE_PULL_REGEX)
+PACK_LIST_PULL = re.compile(PACK_LIST_PULL_REGEX)
+PACK_LIST_PULL_TITLE = re.compile(PACK_LIST_PULL_TITLE_REGEX)
+
+PULLALL_TITLE = 'Cards pulled'
+WEEKLY_PULL_TITLE = 'Weekly Pull Result'
+PACK_LIST_FOOTER = 'Click a button below to view the card image'
+
+# The rarity of each star emoji, by the emoji's name
+RARITIES: MappingProxyType[str, int] = MappingProxyType({emoji.name: rarity for rarity, emoji in RARITY_EMOJIS.items()})
+
+type PullShape = tuple[PullType, PackPullView | None]
+
+
+class ParsedPull(NamedTuple):
+    type: PullType
+    author_id: int | None
+    author_name: str | None
+    cards: list[PartialCard]
+    pages: int = 1
+
+
+class PackPage(NamedTuple):
+    page: int
+    total: int
+    card: PartialCard
+
+
+def pull_shape(content: str, embed: discord.Embed) -> PullShape | None:
+    """
+    Tell which kind of pull a message is from its content, embed title and footer.
+
+    Parameters
+    ----------
+    content : str
+        The content of the message
+    embed : discord.Embed
+        The first embed of the message
+
+    Returns
+    -------
+    PullShape | None
+        The pull type and the pack view for packs, None if the message isn't a pull
+
+    """
+    if content:
+        return (PullType.WEEKLY_PULL if embed.title == WEEKLY_PULL_TITLE else PullType.SINGLE_PULL), None
+
+    if embed.title == PULLALL_TITLE:
+        return PullType.PULLALL, None
+
+    footer = embed.footer.text
+    if footer is None:
+        return None
+
+    return PullType.PACK, (PackPullView.LIST_VIEW if footer == PACK_LIST_FOOTER else PackPullView.PAGED_VIEW)
+
+
+def _mentioned(text: str) -> int | None:
+    match = MENTION.search(text)
+    return int(match[1]) if match else None
+
+
+def _card(match: re.Match[str], name: str | None = None) -> PartialCard | None:
+    rarity = RARITIES.get(match['rarity'])
+    if rarity is None:
+        return None
+    return PartialCard(int(match['id']), name if name is not None else match['name'], rarity)
+
+
+def _parse_pullall(_: str, embed: discord.Embed) -> ParsedPull | None:
+    assert embed.description is not None
+
+    lines = embed.description.splitlines()
+    if not lines:
+        return None
+
+    author_id = _mentioned(lines[0])  # The author is on the first line
+    if author_id is None:
+        return None
+
+    cards: list[PartialCard] = []
+    for line in lines[1:]:
+        match = PULLALL_LINE.search(line)
+        card = _card(match) if match else None
+        if card is None:
+            return None
+        cards.append(card)
+
+    return ParsedPull(PullType.PULLALL, author_id, None, cards)
+
+
+def _parse_single_pull(content: str, embed: discord.Embed) -> ParsedPull | None:
+    assert embed.title is not None
+    assert embed.description is not None
+
+    match = SINGLE_PULL.search(embed.description)
+    card = _card(match, embed.title) if match else None
+    author_id = _mentioned(content)
+    if card is None or author_id is None:
+        return None
+
+    return ParsedPull(PullType.SINGLE_PULL, author_id, None, [card])
+
+
+def _parse_weekly_pull(content: str, embed: discord.Embed) -> ParsedPull | None:
+    assert embed.description is not None
+
+    match = WEEKLY_PULL.search(embed.description)
+    card = _card(match) if match else None
+    author_id = _mentioned(content)
+    if card is None or author_id is None:
+        return None
+
+    return ParsedPull(PullType.WEEKLY_PULL, author_id, None, [card])
+
+
+def _parse_pack_list(_: str, embed: discord.Embed) -> ParsedPull | None:
+    assert embed.title is not None
+    assert embed.description is not None
+
+    title = PACK_LIST_PULL_TITLE.search(embed.title)
+    if title is None:
+        return None
+
+    cards: list[PartialCard] = []
+    for line in embed.description.splitlines():
+        match = PACK_LIST_PULL.search(line)
+        if match is None:
+            return None
+
+        if match['rarity'] is None:
+            cards.append(PartialCard(int(match['id']), match['name'], 'EVENT'))
+        elif card := _card(match):
+            cards.append(card)
+        else:
+            return None
+
+    return ParsedPull(PullType.PACK, None, title[1], cards)
+
+
+def _parse_pack_paged(_: str, embed: discord.Embed) -> ParsedPull | None:
+    assert embed.title is not None
+
+    title = PACK_LIST_PULL_TITLE.search(embed.title)
+    page = parse_pack_page(embed)
+    if title is None or page is None or page.page != 1:
+        return None  # A pack which didn't open on its first page won't be paged through
+
+    return ParsedPull(PullType.PACK, None, title[1], [page.card], page.total)
+
+
+# The parser of each pull shape
+PARSERS: MappingProxyType[PullShape, Callable[[str, discord.Embed], ParsedPull | None]] = MappingProxyType({
+    (PullType.PULLALL, None): _parse_pullall,
+    (PullType.SINGLE_PULL, None): _parse_single_pull,
+    (PullType.WEEKLY_PULL, None): _parse_weekly_pull,
+    (PullType.PACK, PackPullView.LIST_VIEW): _parse_pack_list,
+    (PullType.PACK, PackPullView.PAGED_VIEW): _parse_pack_paged,
+})
+
+
+def parse_pack_page(embed: discord.Embed) -> PackPage | None:
+    """
+    Parse the card shown on a page of a paged pack.
+
+    Parameters
+    ----------
+    embed : discord.Embed
+        The embed of the pack's message as it shows the page
+
+    Returns
+    -------
+    PackPage | None
+        The page, the amount of pages and the card, None if the embed doesn't match
+
+    """
+    if embed.description is None or embed.footer.text is None:
+        return None
+
+    page, _, total = embed.footer.text.removeprefix('Page ').partition('/')
+    match = PACK_PAGE_PULL.search(embed.description)
+    card = _card(match) if match else None
+    if card is None or not page.isdigit() or not total.isdigit():
+        return None
+
+    return PackPage(int(page), int(total), card)
+
+
+def parse_message(message: discord.Message) -> ParsedPull | None:
+    """
+    Parse the author and cards of a pull in one pass over the message.
+
+    Parameters
+    ----------
+    message : discord.Message
+        The message to be parsed
+
+    Returns
+    -------
+    ParsedPull | None
+        The parsed pull, None if the message isn't a pull or doesn't match the expected format
+
+    """
+    if not message.embeds:
+        return None
+
+    embed = message.embeds[0]
+    if embed.title is None or embed.description is None:
+        return None  # Embed is clearly not supposed to be a trackable embed
+
+    shape = pull_shape(message.content, embed)
+    if shape is None:
+        return None
+
+    parsed = PARSERS[shape](message.content, embed)
+    if parsed is None:
+        log.debug('Message %s looked like a %s but did not parse', message.id, shape[0].name)
+
+    return parsed
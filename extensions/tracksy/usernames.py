@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import discord
+
+
+__all__ = ('UsernameIndex',)
+
+log = logging.getLogger(__name__)
+
+
+class UsernameIndex:
+    """
+    Maps usernames to the IDs of cached users.
+
+    The index is rebuilt from the user cache and kept up to date from user and member events.
+    Entries can go stale between events, so every hit is checked against the cache and a miss
+    falls back to asking the gateway for the guild's members of that name.
+    """
+
+    def __init__(self, client: discord.Client) -> None:
+        self.client = client
+        self._ids: dict[str, int] = {}
+
+        super().__init__()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def rebuild(self) -> None:
+        """Index every user in the cache."""
+        self._ids = {user.name: user.id for user in self.client.users}
+
+    def add(self, user: discord.abc.User) -> None:
+        self._ids[user.name] = user.id
+
+    def rename(self, before: discord.abc.User, after: discord.abc.User) -> None:
+        if self._ids.get(before.name) == before.id:
+            del self._ids[before.name]
+        self._ids[after.name] = after.id
+
+    def get(self, name: str) -> discord.User | None:
+        """
+        Get a cached user by their username.
+
+        Parameters
+        ----------
+        name : str
+            The username
+
+        Returns
+        -------
+        discord.User | None
+            The user, None if no cached user has this username
+
+        """
+        user_id = self._ids.get(name)
+        if user_id is None:
+            return None
+
+        user = self.client.get_user(user_id)
+        if user is None or user.name != name:
+            del self._ids[name]  # Left the cache or was renamed without an event
+            return None
+
+        return user
+
+    async def resolve(self, name: str, guild: discord.Guild | None) -> discord.User | None:
+        """
+        Get a user by their username, asking the gateway for the guild's members on a miss.
+
+        Parameters
+        ----------
+        name : str
+            The username
+        guild : discord.Guild | None
+            The guild the user is expected to be in
+
+        Returns
+        -------
+        discord.User | None
+            The user, None if they couldn't be found
+
+        """
+        user = self.get(name)
+        if user is not None or guild is None or not self.client.intents.members:
+            return user
+
+        try:
+            members = await guild.query_members(name, limit=5)
+        except TimeoutError:
+            log.warning('Timed out looking up the member %r in %s', name, guild.id)
+            return None
+
+        for member in members:
+            self.add(member)
+
+        # Members are cached by the query, so the cached user is returned like on a hit
+        return self.get(name)
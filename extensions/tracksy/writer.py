@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import asyncio
+import datetime
+import json
+import logging
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import asyncpg
+
+from config import TRACKSY_BATCH_SIZE, TRACKSY_FLUSH_INTERVAL, TRACKSY_QUEUE_SIZE, TRACKSY_SPILL_PATH
+
+if TYPE_CHECKING:
+    import discord
+    from asyncpg.pool import PoolConnectionProxy
+
+    from extensions.tracksy.types import Pull
+    from utilities.bases.bot import Cyrene
+
+
+__all__ = ('PullWriter',)
+
+log = logging.getLogger(__name__)
+
+# channel_id, message_id, user_id, card_id, card_name, rarity, pull_source
+type PulledCardRow = tuple[int, int, int, int, str, int, int]
+
+# Raised while Postgres can't be reached, is restarting or failing over, or the pool is closing.
+# Any error from the server which isn't a rejection of the rows themselves is treated as one of these.
+UNAVAILABLE_ERRORS = (OSError, TimeoutError, asyncpg.PostgresError, asyncpg.InterfaceError)
+
+# Raised by the server for rows which can never be written. DataError is the data exceptions of SQLSTATE
+# class 22, codes of that class asyncpg has no subclass for are checked by their SQLSTATE
+REJECTED_ERRORS = (asyncpg.DataError, asyncpg.IntegrityConstraintViolationError)
+
+
+def _columns(rows: list[PulledCardRow]) -> list[list[object]]:
+    return [list(column) for column in zip(*rows, strict=True)]
+
+
+def _is_rejection(error: Exception) -> bool:
+    # The client's DataError, raised for values it can't encode such as a card ID outside int4,
+    # subclasses InterfaceError, so it is checked before the unavailable errors
+    if isinstance(error, (asyncpg.exceptions._base.DataError, *REJECTED_ERRORS)):  # pyright: ignore[reportPrivateUsage]
+        return True
+    return isinstance(error, asyncpg.PostgresError) and str(error.sqlstate).startswith('22')
+
+
+class PullWriter:
+    """
+    Writes pulled cards to GachaPulledCards behind the tracker.
+
+    Cards are put on a bounded queue and written by a background task in batches of up to
+    TRACKSY_BATCH_SIZE, at most TRACKSY_FLUSH_INTERVAL seconds after the first card of the
+    batch was queued. The tracker waits while the queue is full.
+
+    Batches which can't be written because Postgres is unreachable, restarting or failing over
+    are appended to the spill file. The file is replayed in one transaction after the next successful write, every
+    RETRY_INTERVAL seconds while nothing is queued and when the writer starts.
+
+    A batch with rows which can never be written is bisected down to those rows, so the rest
+    are still written. The bad rows are quarantined to a file of their own next to the spill file.
+    """
+
+    RETRY_INTERVAL = 30.0
+
+    def __init__(self, bot: Cyrene) -> None:
+        self.bot = bot
+        self.spill_path = Path(TRACKSY_SPILL_PATH)
+
+        # None asks the writer to stop once everything queued before it is written
+        self.queue: asyncio.Queue[PulledCardRow | None] = asyncio.Queue(maxsize=TRACKSY_QUEUE_SIZE)
+        self.task: asyncio.Task[None] | None = None
+        self._stopping = False
+
+        super().__init__()
+
+    def start(self) -> None:
+        self.task = asyncio.create_task(self.run())
+
+    async def put(self, message: discord.Message, pull: Pull) -> None:
+        """
+        Queue every card of a pull to be written.
+
+        Parameters
+        ----------
+        message : discord.Message
+            The message the pull was parsed from
+        pull : Pull
+            The parsed pull
+
+        """
+        for card in pull.cards:
+            await self.queue.put((
+                message.channel.id,
+                message.id,
+                pull.user.id,
+                card.id,
+                card.name,
+                card.rarity if card.rarity != 'EVENT' else 7,
+                pull.type,
+            ))
+
+    async def run(self) -> None:
+        await self._flush([])  # Replays what a previous run left behind
+
+        while not self._stopping:
+            await self._flush(await self._collect())
+
+    async def _flush(self, batch: list[PulledCardRow]) -> None:
+        # Nothing may end the writer, the tracker would wait on the full queue forever
+        try:
+            if batch:
+                await self._write(batch)
+            else:
+                await self._replay()
+        except Exception:
+            log.exception('The writer failed, spilling %s pulled cards to %s', len(batch), self.spill_path)
+            self._spill(batch)
+
+    async def _collect(self) -> list[PulledCardRow]:
+        loop = asyncio.get_running_loop()
+        timeout = self.RETRY_INTERVAL if self.spill_path.exists() else None
+
+        try:
+            row = await asyncio.wait_for(self.queue.get(), timeout=timeout)
+        except TimeoutError:
+            return []
+
+        batch: list[PulledCardRow] = []
+        deadline = loop.time() + TRACKSY_FLUSH_INTERVAL
+
+        while True:
+            if row is None:
+                self._stopping = True
+                break
+
+            batch.append(row)
+            if len(batch) >= TRACKSY_BATCH_SIZE:
+                break
+
+            if not self.queue.empty():
+                row = self.queue.get_nowait()
+                continue
+
+            try:
+                row = await asyncio.wait_for(self.queue.get(), timeout=max(deadline - loop.time(), 0))
+            except TimeoutError:
+                break
+
+        return batch
+
+    async def _write(self, batch: list[PulledCardRow]) -> None:
+        try:
+            rejected = await self._insert_batch(batch)
+        except UNAVAILABLE_ERRORS as error:
+            log.warning('Could not write %s pulled cards, spilling them to %s', len(batch), self.spill_path, exc_info=error)
+            self._spill(batch)
+            return
+
+        self._quarantine(rejected)
+        await self._replay()
+
+    async def _insert_batch(self, batch: list[PulledCardRow]) -> list[PulledCardRow]:
+        try:
+            await self.bot.db.execute('gacha_pulls.insert_batch', *_columns(batch))
+        except Exception as error:
+            if not _is_rejection(error):
+                raise
+        else:
+            return []
+
+        # All or nothing, so the batch can be spilled whole if Postgres goes away while bisecting
+        async with self.bot.pool.acquire() as connection, connection.transaction():
+            return await self._insert(batch, connection)
+
+    async def _insert(
+        self, rows: list[PulledCardRow], connection: PoolConnectionProxy[asyncpg.Record]
+    ) -> list[PulledCardRow]:
+        # Bisects rows which are rejected together, returning the ones rejected on their own
+        try:
+            async with connection.transaction():  # A savepoint, so a rejection doesn't abort the outer transaction
+                await self.bot.db.execute('gacha_pulls.insert_batch', *_columns(rows), connection=connection)
+        except Exception as error:
+            if not _is_rejection(error):
+                raise
+
+            if len(rows) == 1:
+                return rows
+
+            middle = len(rows) // 2
+            return await self._insert(rows[:middle], connection) + await self._insert(rows[middle:], connection)
+
+        return []
+
+    def _quarantine(self, rows: list[PulledCardRow]) -> None:
+        if not rows:
+            return
+
+        # Named after when they were rejected, so no rejection overwrites another
+        now = datetime.datetime.now(tz=datetime.UTC)
+        path = self.spill_path.with_name(f'{self.spill_path.stem}-{now:%Y%m%dT%H%M%S%f}.rejected')
+        with path.open('a', encoding='utf-8') as file:
+            file.writelines(json.dumps(row) + '\n' for row in rows)
+
+        log.error('Quarantined %s pulled cards which can never be written to %s', len(rows), path)
+
+    def _spill(self, rows: list[PulledCardRow]) -> None:
+        if not rows:
+            return
+
+        try:
+            with self.spill_path.open('a', encoding='utf-8') as file:
+                file.writelines(json.dumps(row) + '\n' for row in rows)
+        except OSError:
+            log.exception('Dropping %s pulled cards which could not be spilled to %s', len(rows), self.spill_path)
+
+    def _read_spill(self) -> list[PulledCardRow]:
+        rows: list[PulledCardRow] = []
+
+        for line in self.spill_path.read_text(encoding='utf-8').splitlines():
+            try:
+                rows.append(tuple(json.loads(line)))
+            except json.JSONDecodeError:
+                log.warning('Skipping a torn line in %s: %r', self.spill_path, line)
+
+        return rows
+
+    async def _replay(self) -> None:
+        if not self.spill_path.exists():
+            return
+
+        rows = self._read_spill()
+        rejected: list[PulledCardRow] = []
+
+        try:
+            # All or nothing, so a failed replay can be retried without writing any row twice
+            async with self.bot.pool.acquire() as connection, connection.transaction():
+                for start in range(0, len(rows), TRACKSY_BATCH_SIZE):
+                    rejected += await self._insert(rows[start : start + TRACKSY_BATCH_SIZE], connection)
+        except UNAVAILABLE_ERRORS as error:
+            log.warning('Could not replay %s, retrying later', self.spill_path, exc_info=error)
+            return
+
+        self._quarantine(rejected)
+        self.spill_path.unlink()
+        log.info('Replayed %s spilled pulled cards from %s', len(rows), self.spill_path)
+
+    async def close(self) -> None:
+        """Write everything queued, spilling it if Postgres is unreachable, and stop the writer."""
+        if self.task is not None and not self.task.done():
+            await self.queue.put(None)
+            await self.task
+
+        # Left on the queue if the writer wasn't running
+        rows: list[PulledCardRow] = []
+        while not self.queue.empty():
+            if (row := self.queue.get_nowait()) is not None:
+                rows.append(row)
+
+        self._spill(rows)
@@ -9,6 +9,8 @@ from discord.ext import commands
 
 from utilities.bases.bot import Cyrene
 from utilities.bases.cog import CyCog
+from utilities.constants import BotEmojis
+from utilities.functions import fmt_str
 
 if TYPE_CHECKING:
     from utilities.bases.bot import Cyrene
@@ -30,10 +32,10 @@ class Utility(CyCog, name='Utility'):
         return {'Bot': count}
 
     async def _complex_cleanup_strategy(self, ctx: CyContext, search: int) -> None | Counter[str]:
-        prefixes = tuple(self.bot.get_prefixes(ctx.guild))  # thanks startswith
+        matcher = self.bot.get_prefix_matcher(ctx.guild)
 
         def check(m: discord.Message) -> bool:
-            return m.author == ctx.me or m.content.startswith(prefixes)
+            return m.author == ctx.me or matcher.match(m.content) is not None
 
         if isinstance(ctx.channel, discord.DMChannel | discord.PartialMessageable | discord.GroupChannel):
             return None
@@ -42,10 +44,10 @@ class Utility(CyCog, name='Utility'):
         return Counter(m.author.display_name for m in deleted)
 
     async def _regular_user_cleanup_strategy(self, ctx: CyContext, search: int) -> None | Counter[str]:
-        prefixes = tuple(self.bot.get_prefixes(ctx.guild))
+        matcher = self.bot.get_prefix_matcher(ctx.guild)
 
         def check(m: discord.Message) -> bool:
-            return (m.author == ctx.me or m.content.startswith(prefixes)) and not (m.mentions or m.role_mentions)
+            return (m.author == ctx.me or matcher.match(m.content) is not None) and not (m.mentions or m.role_mentions)
 
         if isinstance(ctx.channel, discord.DMChannel | discord.PartialMessageable | discord.GroupChannel):
             return None
@@ -77,6 +79,29 @@ class Utility(CyCog, name='Utility'):
 
         await ctx.send('\n'.join(messages), delete_after=10)
 
+    @commands.group(name='prefix', aliases=['prefixes'], invoke_without_command=True)
+    async def prefix(self, ctx: CyContext) -> None:
+        prefixes = self.bot.get_prefixes(ctx.guild)
+        await ctx.reply(fmt_str((f'- `{p}`' for p in prefixes), seperator='\n'))
+
+    @prefix.command(name='add', description='Add a prefix to this server')
+    @commands.guild_only()
+    @commands.has_guild_permissions(manage_guild=True)
+    async def prefix_add(self, ctx: CyContext, *, prefix: str) -> None:
+        assert ctx.guild is not None
+
+        await self.bot.prefix_manager.add(ctx.guild, prefix)
+        await ctx.message.add_reaction(BotEmojis.GREEN_TICK)
+
+    @prefix.command(name='remove', description='Remove a prefix from this server')
+    @commands.guild_only()
+    @commands.has_guild_permissions(manage_guild=True)
+    async def prefix_remove(self, ctx: CyContext, *, prefix: str) -> None:
+        assert ctx.guild is not None
+
+        await self.bot.prefix_manager.remove(ctx.guild, prefix)
+        await ctx.message.add_reaction(BotEmojis.GREEN_TICK)
+
 
 async def setup(bot: Cyrene) -> None:
     await bot.add_cog(Utility(bot))
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import multiprocessing
+import os
+import signal
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import aiohttp
+import discord
+from discord.ext import commands
+
+from config import CACHE_PROFILES, DATABASE_CRED
+from utilities.bases.bot import Cyrene
+from utilities.cluster import ClusterClient, ClusterHub, fetch_recommended_shards, shard_ranges
+from utilities.database import Database, create_pool
+from utilities.event_loop import loop_factory
+from utilities.migrations import apply_migrations
+from utilities.profiling import startup_profiler
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+    import asyncpg
+
+
+__all__ = (
+    'create_bot_pool',
+    'run_bot',
+    'run_cluster',
+    'run_clusters',
+    'setup_logging',
+)
+
+# Cluster processes are spawned, so their entry point lives here rather than in __main__,
+# which a spawned process can't import when the bot is started with ``python3 .``
+
+# Seconds clusters get to close after the launcher is asked to stop, before they are killed
+SHUTDOWN_TIMEOUT = 30.0
+
+_closing: set[asyncio.Task[None]] = set()
+
+
+@contextlib.contextmanager
+def setup_logging() -> Generator[Any, Any, Any]:
+    discord.utils.setup_logging()
+
+    logging.getLogger('discord').setLevel(logging.WARNING)
+    logging.getLogger('discord.http').setLevel(logging.WARNING)
+    yield
+
+
+async def create_bot_pool() -> asyncpg.Pool[asyncpg.Record]:
+    with startup_profiler.span('pool'):
+        pool = await create_pool(DATABASE_CRED)
+
+    if not pool or pool.is_closing():
+        msg = 'Failed to create a pool.'
+        raise RuntimeError(msg)
+
+    with startup_profiler.span('migrations'):
+        await apply_migrations(pool)
+
+    return pool
+
+
+async def _callable_prefix(bot: Cyrene, message: discord.Message) -> list[str]:
+    prefixes = commands.when_mentioned(bot, message)
+
+    if (prefix := bot.get_prefix_matcher(message.guild).match(message.content)) is not None:
+        prefixes.append(prefix)
+
+    return prefixes
+
+
+def _close_on_sigterm(bot: Cyrene) -> None:
+    # Closed like any other shutdown, so the extensions, timers and pool are drained first
+    loop = asyncio.get_running_loop()
+
+    def close() -> None:
+        if _closing or bot.is_closed():  # Closing twice would unload the extensions twice
+            return
+
+        task = loop.create_task(bot.close())
+        _closing.add(task)
+        task.add_done_callback(_closing.discard)
+
+    loop.add_signal_handler(signal.SIGTERM, close)
+
+
+async def run_bot(
+    token: str,
+    *,
+    cache_profile: str,
+    shard_ids: list[int] | None = None,
+    shard_count: int | None = None,
+    cluster: ClusterClient | None = None,
+) -> None:
+    pool = await create_bot_pool()
+    allowed_mentions = discord.AllowedMentions(everyone=False, users=True, roles=False, replied_user=False)
+    session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=60))
+
+    extensions = [
+        'extensions.animanga',
+        'extensions.internals',
+        'extensions.meta',
+        'extensions.utility',
+        'extensions.tracksy',
+    ]
+
+    async with Cyrene(
+        command_prefix=_callable_prefix,
+        extensions=extensions,
+        allowed_mentions=allowed_mentions,
+        session=session,
+        shard_ids=shard_ids,
+        shard_count=shard_count,
+        cluster=cluster,
+        **CACHE_PROFILES[cache_profile],
+    ) as bot:
+        bot.pool = pool
+        bot.db = Database(pool)
+        _close_on_sigterm(bot)
+        await bot.start(token)
+
+
+def run_cluster(
+    token: str,
+    *,
+    cache_profile: str,
+    event_loop: str,
+    cluster_id: int,
+    cluster_count: int,
+    shard_ids: list[int],
+    shard_count: int,
+    path: str,
+    profile_output: Path | None = None,
+) -> None:
+    # Entry point of a cluster process
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # The launcher forwards it as SIGTERM
+
+    if profile_output is not None:
+        startup_profiler.enable()
+        startup_profiler.output = profile_output.with_stem(f'{profile_output.stem}-cluster{cluster_id}')
+
+    with setup_logging():
+        cluster = ClusterClient(cluster_id=cluster_id, cluster_count=cluster_count, path=path)
+        asyncio.run(
+            run_bot(token, cache_profile=cache_profile, shard_ids=shard_ids, shard_count=shard_count, cluster=cluster),
+            loop_factory=loop_factory(event_loop),
+        )
+
+
+async def run_clusters(
+    token: str,
+    *,
+    cache_profile: str,
+    event_loop: str,
+    clusters: int,
+    shard_count: int | None,
+    profile_output: Path | None = None,
+) -> None:
+    shard_count = shard_count or await fetch_recommended_shards(token)
+    ranges = shard_ranges(shard_count, min(clusters, shard_count))
+
+    path = str(Path(tempfile.gettempdir()) / f'cyrene-{os.getpid()}.sock')
+    hub = ClusterHub(path)
+    await hub.start()
+
+    context = multiprocessing.get_context('spawn')
+    processes = [
+        context.Process(
+            target=run_cluster,
+            name=f'cyrene-cluster-{cluster_id}',
+            args=(token,),
+            kwargs={
+                'cache_profile': cache_profile,
+                'event_loop': event_loop,
+                'cluster_id': cluster_id,
+                'cluster_count': len(ranges),
+                'shard_ids': shard_ids,
+                'shard_count': shard_count,
+                'path': path,
+                'profile_output': profile_output,
+            },
+        )
+        for cluster_id, shard_ids in enumerate(ranges)
+    ]
+
+    loop = asyncio.get_running_loop()
+
+    def kill() -> None:
+        for process in processes:
+            if process.is_alive():
+                process.kill()
+
+    def stop() -> None:
+        # Every cluster closes its bot on SIGTERM, the ones still running after the timeout are killed
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        loop.call_later(SHUTDOWN_TIMEOUT, kill)
+
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(signum, stop)
+
+    for process, shard_ids in zip(processes, ranges, strict=True):
+        process.start()
+        logging.getLogger('Cyrene').info('Started %s with shards %s', process.name, shard_ids)
+
+    try:
+        await asyncio.gather(*(asyncio.to_thread(process.join) for process in processes))
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+        await hub.close()
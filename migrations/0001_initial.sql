@@ -75,5 +75,3 @@ CREATE TABLE IF NOT EXISTS GachaPulledCards (
         rarity INTEGER NOT NULL,
         pull_source INTEGER NOT NULL
 );
-
-COMMIT;
\ No newline at end of file
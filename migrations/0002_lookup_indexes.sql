@@ -0,0 +1,6 @@
+-- Statistics are always fetched per user
+CREATE INDEX IF NOT EXISTS gachapulledcards_user_id_idx ON GachaPulledCards (user_id);
+
+-- Known error lookups in the error handler. The error text is hashed, as a full traceback
+-- can be longer than a btree entry may be
+CREATE INDEX IF NOT EXISTS errors_command_error_idx ON Errors (command, md5(error)) WHERE NOT fixed;
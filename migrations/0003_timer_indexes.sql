@@ -0,0 +1,5 @@
+-- The scheduler loads and claims timers by expiry
+CREATE INDEX IF NOT EXISTS timers_expires_idx ON Timers (expires);
+
+-- Timer lookups and cancellations by user and reserved type
+CREATE INDEX IF NOT EXISTS timers_user_id_reserved_type_idx ON Timers (user_id, reserved_type);
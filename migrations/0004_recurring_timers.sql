@@ -0,0 +1,2 @@
+-- Recurring timers are rescheduled in place by this interval instead of being deleted
+ALTER TABLE Timers ADD COLUMN IF NOT EXISTS recurrence INTERVAL CHECK (recurrence > INTERVAL '0');
@@ -0,0 +1,3 @@
+-- A timer is leased by the process firing it, so several processes can share the table
+ALTER TABLE Timers ADD COLUMN IF NOT EXISTS leased_by TEXT;
+ALTER TABLE Timers ADD COLUMN IF NOT EXISTS lease_expires TIMESTAMP WITH TIME ZONE;
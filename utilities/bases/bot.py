@@ -1,27 +1,43 @@
 from __future__ import annotations
 
+import ast
+import asyncio
+import contextvars
 import datetime
-import itertools
+import graphlib
+import importlib.util
+import json
 import logging
-from typing import TYPE_CHECKING, Self
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Self, TypedDict
 
 import discord
 import jishaku
 import mystbin
+import psutil
 from discord.ext import commands
 
 if TYPE_CHECKING:
     from collections.abc import Iterable
+    from importlib.machinery import ModuleSpec
+    from types import ModuleType
 
     from aiohttp import ClientSession
     from asyncpg import Pool, Record
+    from discord.types.invite import Invite as InvitePayload
 
     from extensions.internals.blacklist import BlacklistData
+    from utilities.cluster import ClusterClient
+    from utilities.database import Database
 
 
 from config import DEFAULT_PREFIX, OWNER_IDS
 from utilities.bases.context import CyContext
 from utilities.constants import BASE_COLOUR
+from utilities.prefixes import PrefixManager, PrefixMatcher
+from utilities.profiling import startup_profiler
 from utilities.timers import TimerManager
 
 log = logging.getLogger('Cyrene')
@@ -31,11 +47,65 @@ jishaku.Flags.HIDE = True
 jishaku.Flags.NO_DM_TRACEBACK = True
 jishaku.Flags.NO_UNDERSCORE = True
 
+SUPPORT_INVITE = 'https://discord.gg/SaefBj273K'
 
-class Cyrene(commands.AutoShardedBot):
+BOOTSTRAP_SNAPSHOT = Path('.cache/bootstrap.json')
+BOOTSTRAP_SNAPSHOT_TTL = datetime.timedelta(hours=12)
+
+_loading_extension: contextvars.ContextVar[str | None] = contextvars.ContextVar('_loading_extension', default=None)
+
+
+class InviteSnapshot(TypedDict):
+    fetched_at: float
+    data: InvitePayload
+
+
+class BootstrapSnapshot(TypedDict, total=False):
+    support_invite: InviteSnapshot
+
+
+def _read_bootstrap_snapshot() -> BootstrapSnapshot:
+    try:
+        return json.loads(BOOTSTRAP_SNAPSHOT.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_bootstrap_snapshot(snapshot: BootstrapSnapshot) -> None:
+    try:
+        BOOTSTRAP_SNAPSHOT.parent.mkdir(parents=True, exist_ok=True)
+        BOOTSTRAP_SNAPSHOT.write_text(json.dumps(snapshot), encoding='utf-8')
+    except OSError:
+        log.warning('Could not write the bootstrap snapshot to %s', BOOTSTRAP_SNAPSHOT)
+
+
+def _read_dependencies(extension: str) -> tuple[str, ...]:
+    # Read from the source, so the module is only executed once, by load_extension
+    spec = importlib.util.find_spec(extension)
+    if spec is None or spec.origin is None:
+        return ()
+
+    for node in ast.parse(Path(spec.origin).read_text(encoding='utf-8')).body:
+        if isinstance(node, ast.Assign) and any(isinstance(_, ast.Name) and _.id == 'DEPENDENCIES' for _ in node.targets):
+            return tuple(ast.literal_eval(node.value))
+
+    return ()
+
+
+@dataclass
+class ExtensionTiming:
+    import_time: float = 0.0
+    setup_time: float = 0.0
+    cog_load_time: float = 0.0
+    loaded: bool = False
+
+
+class Cyrene(commands.AutoShardedBot):  # noqa: PLR0904
     pool: Pool[Record]
+    db: Database
     user: discord.ClientUser
     timer_manager: TimerManager
+    prefix_manager: PrefixManager
 
     def __init__(
         self,
@@ -45,6 +115,12 @@ class Cyrene(commands.AutoShardedBot):
         intents: discord.Intents,
         allowed_mentions: discord.AllowedMentions,
         session: ClientSession,
+        member_cache_flags: discord.MemberCacheFlags | None = None,
+        chunk_guilds_at_startup: bool | None = None,
+        max_messages: int | None = 1000,
+        shard_ids: list[int] | None = None,
+        shard_count: int | None = None,
+        cluster: ClusterClient | None = None,
         maintenance: bool = False,
     ) -> None:
         super().__init__(
@@ -52,14 +128,24 @@ class Cyrene(commands.AutoShardedBot):
             case_insensitive=True,
             strip_after_prefix=True,
             intents=intents,
+            member_cache_flags=(
+                member_cache_flags if member_cache_flags is not None else discord.MemberCacheFlags.from_intents(intents)
+            ),
+            chunk_guilds_at_startup=intents.members if chunk_guilds_at_startup is None else chunk_guilds_at_startup,
+            max_messages=max_messages,
+            shard_ids=shard_ids,
+            shard_count=shard_count,
             allowed_mentions=allowed_mentions,
             enable_debug_events=True,
             help_command=commands.MinimalHelpCommand(),
         )
 
         self.maintenance = maintenance
+        self.cluster = cluster
 
         self.prefixes: dict[int, list[str]] = {}
+        self._prefix_matchers: dict[int, PrefixMatcher] = {}
+        self._default_prefix_matcher = PrefixMatcher([DEFAULT_PREFIX])
         self.blacklists: dict[int, BlacklistData] = {}
         self.webhooks: dict[str, discord.Webhook] = {}
 
@@ -68,17 +154,34 @@ class Cyrene(commands.AutoShardedBot):
         self.start_time = datetime.datetime.now()
         self.colour = self.color = BASE_COLOUR
         self.initial_extensions = extensions
+        self.extension_timings: dict[str, ExtensionTiming] = {}
 
     async def setup_hook(self) -> None:
         self.timer_manager = TimerManager(self.loop, self)
 
-        await self.refresh_vars()
+        self.prefix_manager = PrefixManager(self)
+        await self.prefix_manager.start()
+
+        if self.cluster:
+            self.cluster.request_handlers['statistics'] = self._cluster_statistics
+            await self.cluster.connect(self)
 
-        await self.load_extensions(self.initial_extensions)
-        await self.load_extension('jishaku')
+        with startup_profiler.span('refresh_vars'):
+            await self.refresh_vars()
+
+        with startup_profiler.span('load_extensions'):
+            await self.load_extensions(self.initial_extensions)
+            await self.load_extension('jishaku')
 
         self.add_check(self.maintenance_check)
 
+    async def on_shard_ready(self, shard_id: int) -> None:
+        startup_profiler.mark(f'shard {shard_id} ready')
+
+    async def on_ready(self) -> None:
+        startup_profiler.mark('ready')
+        startup_profiler.finish(extensions=self.extension_timings)
+
     async def get_context(
         self, origin: discord.Message | discord.Interaction, *, cls: type[CyContext] = CyContext
     ) -> CyContext:
@@ -87,23 +190,130 @@ class Cyrene(commands.AutoShardedBot):
     async def is_owner(self, user: discord.abc.User) -> bool:
         return bool(user.id in OWNER_IDS)
 
+    async def add_cog(self, cog: commands.Cog, /, **kwargs: Any) -> None:
+        start = time.perf_counter()
+        try:
+            await super().add_cog(cog, **kwargs)
+        finally:
+            if (extension := _loading_extension.get()) is not None:
+                self.extension_timings[extension].cog_load_time += time.perf_counter() - start
+
     async def load_extensions(self, extensions: Iterable[str]) -> None:
         """
         Load all extensions for the bot.
 
+        An extension can declare the extensions it needs loaded before itself
+        with a module level ``DEPENDENCIES`` tuple literal, which is read from the
+        source so the extension is only imported by load_extension. Extensions whose
+        dependencies are loaded are loaded concurrently, and a timing table is logged afterwards.
+
         Parameters
         ----------
         extensions : Iterable[str]
             The list of extensions to be loaded
 
         """
+        extensions = list(extensions)
+        graph: dict[str, tuple[str, ...]] = {}
+
         for extension in extensions:
+            self.extension_timings[extension] = ExtensionTiming()
+
+            try:
+                graph[extension] = _read_dependencies(extension)
+            except Exception as exc:
+                log.exception(
+                    'An exception occured while reading the dependencies of extension: %s', extension, exc_info=exc
+                )
+
+        try:
+            order = list(graphlib.TopologicalSorter(graph).static_order())
+        except graphlib.CycleError as exc:
+            cycle = ' -> '.join(exc.args[1])
+            log.exception('Extensions depend on each other in a cycle, loading them one by one: %s', cycle, exc_info=exc)
+
+            for extension in graph:
+                await self._load_extension_after(extension, (), {})
+        else:
+            tasks: dict[str, asyncio.Task[bool]] = {}
+            for extension in order:
+                if extension in graph:
+                    tasks[extension] = asyncio.create_task(self._load_extension_after(extension, graph[extension], tasks))
+
+            await asyncio.gather(*tasks.values())
+
+        self._log_extension_timings(extensions)
+
+    async def _load_extension_after(
+        self,
+        extension: str,
+        dependencies: tuple[str, ...],
+        tasks: dict[str, asyncio.Task[bool]],
+    ) -> bool:
+        for dependency in dependencies:
+            task = tasks.get(dependency)
+            loaded = await task if task else dependency in self.extensions
+
+            if not loaded:
+                log.error('Not loading %s as its dependency %s is not loaded', extension, dependency)
+                return False
+
+        timing = self.extension_timings[extension]
+        token = _loading_extension.set(extension)
+        start = time.perf_counter()
+
+        try:
+            await self.load_extension(extension)
+        except commands.ExtensionError as exc:
+            log.exception('An exception occured while loading extension: %s', extension, exc_info=exc)
+        else:
+            timing.loaded = True
+            log.info('Loaded %s', extension)
+        finally:
+            timing.setup_time = time.perf_counter() - start - timing.import_time - timing.cog_load_time
+            _loading_extension.reset(token)
+
+        return timing.loaded
+
+    async def _load_from_module_spec(self, spec: ModuleSpec, key: str) -> None:
+        loader = spec.loader
+        if _loading_extension.get() != key or loader is None:
+            await super()._load_from_module_spec(spec, key)
+            return
+
+        timing = self.extension_timings[key]
+        exec_module = loader.exec_module
+
+        def timed_exec_module(module: ModuleType) -> None:
+            start = time.perf_counter()
             try:
-                await self.load_extension(extension)
-            except commands.ExtensionFailed as exc:
-                log.exception('An exception occured while loading extension: %s', extension, exc_info=exc)
-            else:
-                log.info('Loaded %s', extension)
+                exec_module(module)
+            finally:
+                timing.import_time = time.perf_counter() - start
+
+        # Each spec gets its own loader, so shadowing the method only times this extension's import
+        loader.exec_module = timed_exec_module  # pyright: ignore[reportAttributeAccessIssue]
+        try:
+            await super()._load_from_module_spec(spec, key)
+        finally:
+            del loader.exec_module
+
+    def _log_extension_timings(self, extensions: Iterable[str]) -> None:
+        rows = [
+            f'{"extension":<24} {"import":>9} {"setup":>9} {"cog_load":>9} {"total":>9}',
+        ]
+        for extension in extensions:
+            timing = self.extension_timings[extension]
+            total = timing.import_time + timing.setup_time + timing.cog_load_time
+            rows.append(
+                (
+                    f'{extension:<24} {timing.import_time * 1000:>7.1f}ms {timing.setup_time * 1000:>7.1f}ms '
+                    f'{timing.cog_load_time * 1000:>7.1f}ms {total * 1000:>7.1f}ms'
+                )
+                + ('' if timing.loaded else ' (failed)')
+            )
+
+        log.info('Extension load timings:\n%s', '\n'.join(rows))
 
     async def unload_extensions(self, extensions: Iterable[str]) -> None:
         """
@@ -148,14 +358,55 @@ class Cyrene(commands.AutoShardedBot):
             A list of prefixes for a guild if provided. Defaults to base prefix
 
         """
-        base_prefix = self.prefixes.get(guild.id, [DEFAULT_PREFIX]) if guild else [DEFAULT_PREFIX]
+        return self.prefixes.get(guild.id, [DEFAULT_PREFIX]) if guild else [DEFAULT_PREFIX]
+
+    def get_prefix_matcher(self, guild: discord.Guild | None) -> PrefixMatcher:
+        """
+        Get the case-insensitive prefix matcher for a guild if given.
+
+        Matchers are built once per guild and reused until invalidated.
+
+        Parameters
+        ----------
+        guild : discord.Guild | None
+            The guild to get the prefix matcher of.
+
+        Returns
+        -------
+        PrefixMatcher
+            The matcher for the guild's prefixes. Defaults to the base prefix matcher
+
+        """
+        if guild is None or guild.id not in self.prefixes:
+            return self._default_prefix_matcher
+
+        matcher = self._prefix_matchers.get(guild.id)
+        if matcher is None:
+            matcher = self._prefix_matchers[guild.id] = PrefixMatcher(self.prefixes[guild.id])
+
+        return matcher
+
+    def invalidate_prefix_matcher(self, guild_id: int) -> None:
+        """
+        Drop the cached prefix matcher of a guild.
+
+        This must be called whenever the prefixes of a guild are changed.
 
-        prefixes: list[str] = []
-        for entry in base_prefix:
-            char_options = [(c.lower(), c.upper()) for c in entry]
-            prefixes.extend([''.join(combo) for combo in itertools.product(*char_options)])
+        Parameters
+        ----------
+        guild_id : int
+            The ID of the guild whose prefixes changed
 
-        return prefixes
+        """
+        self._prefix_matchers.pop(guild_id, None)
+
+    def invalidate_all_prefix_matchers(self) -> None:
+        """
+        Drop the cached prefix matchers of every guild.
+
+        This must be called whenever the whole prefix cache is replaced.
+        """
+        self._prefix_matchers.clear()
 
     def is_blacklisted(self, snowflake: discord.User | discord.Member | discord.Guild | int) -> BlacklistData | None:
         """
@@ -182,6 +433,49 @@ class Cyrene(commands.AutoShardedBot):
         await ctx.reply('Bot is under maintenance', delete_after=10.0)
         return False
 
+    def statistics(self) -> dict[str, int]:
+        """
+        Get the statistics of this process.
+
+        Returns
+        -------
+        dict[str, int]
+            The amount of guilds, users and bots cached and the memory used in bytes
+
+        """
+        return {
+            'guilds': len(self.guilds),
+            'users': len(self.users),
+            'bots': len([_ for _ in self.users if _.bot is True]),
+            'memory': psutil.Process().memory_info().rss,
+        }
+
+    async def cluster_statistics(self) -> dict[str, int]:
+        """
+        Get the statistics of every cluster added together.
+
+        This is the same as statistics when the bot isn't clustered. Users and bots are
+        summed per cluster, so those in guilds of several clusters are counted more than once.
+
+        Returns
+        -------
+        dict[str, int]
+            The amount of guilds, users and bots cached and the memory used in bytes
+
+        """
+        totals = self.statistics()
+        if not self.cluster:
+            return totals
+
+        for stats in await self.cluster.request('statistics'):
+            for key, value in stats.items():
+                totals[key] = totals.get(key, 0) + value
+
+        return totals
+
+    async def _cluster_statistics(self, _: dict[str, Any]) -> dict[str, Any]:
+        return self.statistics()
+
     async def create_paste(self, filename: str, content: str) -> mystbin.Paste:
         """
         Create a mystbin paste.
@@ -202,13 +496,62 @@ class Cyrene(commands.AutoShardedBot):
         file = mystbin.File(filename=filename, content=content)
         return await self.mystbin.create_paste(files=[file])
 
-    async def refresh_vars(self) -> None:
-        """Set values to some bot constants."""
-        self._support_invite = await self.fetch_invite('https://discord.gg/SaefBj273K')
+    async def refresh_vars(self, *, force: bool = False) -> None:
+        """
+        Set values to some bot constants.
 
-        self.appinfo = await self.application_info()
+        Parameters
+        ----------
+        force : bool, optional
+            Whether to ignore the local snapshot and refetch everything, by default False
 
-        webhooks = await self.pool.fetch("""SELECT * FROM Webhooks""")
+        """
+        await asyncio.gather(
+            self.refresh_support_invite(force=force),
+            self.refresh_appinfo(force=force),
+            self.refresh_webhooks(),
+        )
+
+    async def refresh_support_invite(self, *, force: bool = False) -> None:
+        """
+        Set the support server invite.
+
+        The invite is served from a local snapshot unless it is older than the TTL.
+
+        Parameters
+        ----------
+        force : bool, optional
+            Whether to ignore the local snapshot, by default False
+
+        """
+        snapshot = _read_bootstrap_snapshot()
+        entry = snapshot.get('support_invite')
+        now = datetime.datetime.now(tz=datetime.UTC).timestamp()
+
+        if force or not entry or now - entry['fetched_at'] > BOOTSTRAP_SNAPSHOT_TTL.total_seconds():
+            code = discord.utils.resolve_invite(SUPPORT_INVITE).code
+            entry = snapshot['support_invite'] = {'fetched_at': now, 'data': await self.http.get_invite(code)}
+            _write_bootstrap_snapshot(snapshot)
+
+        self._support_invite = discord.Invite.from_incomplete(state=self._connection, data=entry['data'])
+
+    async def refresh_appinfo(self, *, force: bool = False) -> None:
+        """
+        Set the application info of the bot.
+
+        The library already fetches it while logging in, so that is reused unless forced.
+
+        Parameters
+        ----------
+        force : bool, optional
+            Whether to refetch the application info, by default False
+
+        """
+        self.appinfo = self.application if self.application and not force else await self.application_info()
+
+    async def refresh_webhooks(self) -> None:
+        """Set the logging webhooks from the database."""
+        webhooks = await self.db.fetch('webhooks.all')
         self.webhooks = {entry[0]: discord.Webhook.from_url(entry[1], session=self.session) for entry in webhooks}
 
     @property
@@ -253,6 +596,14 @@ class Cyrene(commands.AutoShardedBot):
         )  # MISSING is handled by the library
 
     async def close(self) -> None:
+        # Extensions may still have writes to finish, so they go before the pool
+        for extension in tuple(self.extensions):
+            await self.unload_extension(extension)
+
+        if self.cluster:
+            await self.cluster.close()
+        if hasattr(self, 'prefix_manager'):
+            await self.prefix_manager.close()
         if hasattr(self, 'pool'):
             await self.pool.close()
         if hasattr(self, 'session'):
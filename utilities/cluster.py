@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+import uuid
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, NotRequired, TypedDict
+
+import aiohttp
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from utilities.bases.bot import Cyrene
+
+
+__all__ = (
+    'ClusterClient',
+    'ClusterHub',
+    'fetch_recommended_shards',
+    'shard_ranges',
+)
+
+log = logging.getLogger(__name__)
+
+
+class ClusterMessage(TypedDict):
+    op: str
+    data: dict[str, Any]
+    origin: int
+    nonce: NotRequired[str]
+    to: NotRequired[int]
+
+
+async def fetch_recommended_shards(token: str) -> int:
+    """
+    Fetch the shard count Discord recommends for the bot.
+
+    Parameters
+    ----------
+    token : str
+        The token of the bot
+
+    Returns
+    -------
+    int
+        The recommended shard count
+
+    """
+    async with (
+        aiohttp.ClientSession() as session,
+        session.get(
+            'https://discord.com/api/v10/gateway/bot',
+            headers={'Authorization': f'Bot {token}'},
+        ) as resp,
+    ):
+        resp.raise_for_status()
+        data = await resp.json()
+        return data['shards']
+
+
+def shard_ranges(shard_count: int, clusters: int) -> list[list[int]]:
+    """
+    Split shards into contiguous ranges, one per cluster.
+
+    Parameters
+    ----------
+    shard_count : int
+        The total amount of shards
+    clusters : int
+        The amount of clusters the shards are split across
+
+    Returns
+    -------
+    list[list[int]]
+        The shard IDs owned by each cluster
+
+    """
+    size, extra = divmod(shard_count, clusters)
+    ranges: list[list[int]] = []
+
+    start = 0
+    for cluster_id in range(clusters):
+        end = start + size + (1 if cluster_id < extra else 0)
+        ranges.append(list(range(start, end)))
+        start = end
+
+    return ranges
+
+
+class ClusterHub:
+    """
+    Relays messages between the cluster processes over a Unix socket.
+
+    Messages with a ``to`` key are routed to that cluster, every other message
+    is broadcast to all clusters except the one which sent it.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._writers: dict[int, asyncio.StreamWriter] = {}
+        self._server: asyncio.Server | None = None
+
+        super().__init__()
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_unix_server(self._handle, path=self.path)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        hello = json.loads(await reader.readline())
+        cluster_id: int = hello['origin']
+        self._writers[cluster_id] = writer
+
+        log.info('Cluster %s connected to the hub', cluster_id)
+
+        try:
+            while line := await reader.readline():
+                message: ClusterMessage = json.loads(line)
+
+                if 'to' in message:
+                    targets = [self._writers[message['to']]] if message['to'] in self._writers else []
+                else:
+                    targets = [w for c, w in self._writers.items() if c != cluster_id]
+
+                for target in targets:
+                    target.write(line)
+
+                await asyncio.gather(*(target.drain() for target in targets), return_exceptions=True)
+        finally:
+            del self._writers[cluster_id]
+            writer.close()
+            log.info('Cluster %s disconnected from the hub', cluster_id)
+
+    async def close(self) -> None:
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+        self._remove_socket()
+
+    def _remove_socket(self) -> None:
+        Path(self.path).unlink(missing_ok=True)
+
+
+class ClusterClient:
+    """
+    A cluster's connection to the hub.
+
+    Broadcast operations are dispatched on the bot as ``cluster_<op>`` events.
+    Request operations are answered by the handler registered for them.
+    """
+
+    bot: Cyrene
+
+    def __init__(self, *, cluster_id: int, cluster_count: int, path: str) -> None:
+        self.cluster_id = cluster_id
+        self.cluster_count = cluster_count
+        self.path = path
+
+        self.request_handlers: dict[str, Callable[[dict[str, Any]], Awaitable[dict[str, Any]]]] = {}
+
+        self._writer: asyncio.StreamWriter | None = None
+        self._reader_task: asyncio.Task[None] | None = None
+        self._pending: dict[str, tuple[asyncio.Future[None], list[dict[str, Any]]]] = {}
+
+        super().__init__()
+
+    async def connect(self, bot: Cyrene) -> None:
+        self.bot = bot
+
+        reader, self._writer = await asyncio.open_unix_connection(self.path)
+        await self._send({'op': 'hello', 'data': {}, 'origin': self.cluster_id})
+
+        self._reader_task = asyncio.create_task(self._read_loop(reader))
+
+    async def _send(self, message: ClusterMessage) -> None:
+        if self._writer is None:
+            return
+
+        self._writer.write(json.dumps(message).encode() + b'\n')
+        await self._writer.drain()
+
+    async def broadcast(self, op: str, data: dict[str, Any] | None = None) -> None:
+        """
+        Send an operation to every other cluster.
+
+        Parameters
+        ----------
+        op : str
+            The operation, received as the ``cluster_<op>`` event
+        data : dict[str, Any] | None, optional
+            The data sent along with the operation
+
+        """
+        await self._send({'op': op, 'data': data or {}, 'origin': self.cluster_id})
+
+    async def request(self, op: str, data: dict[str, Any] | None = None, *, max_wait: float = 5.0) -> list[dict[str, Any]]:
+        """
+        Ask every other cluster to answer an operation.
+
+        Parameters
+        ----------
+        op : str
+            The operation being requested
+        data : dict[str, Any] | None, optional
+            The data sent along with the operation
+        max_wait : float, optional
+            How long to wait for the answers, by default 5.0
+
+        Returns
+        -------
+        list[dict[str, Any]]
+            The answers which arrived before the timeout
+
+        """
+        nonce = uuid.uuid4().hex
+        done: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        responses: list[dict[str, Any]] = []
+        self._pending[nonce] = (done, responses)
+
+        try:
+            await self._send({'op': op, 'data': data or {}, 'origin': self.cluster_id, 'nonce': nonce})
+            if self.cluster_count > 1:
+                await asyncio.wait_for(done, timeout=max_wait)
+        except TimeoutError:
+            log.warning('Only %s of %s clusters answered %s', len(responses), self.cluster_count - 1, op)
+        finally:
+            del self._pending[nonce]
+
+        return responses
+
+    async def _read_loop(self, reader: asyncio.StreamReader) -> None:
+        while line := await reader.readline():
+            message: ClusterMessage = json.loads(line)
+            op = message['op']
+
+            if op == 'response':
+                pending = self._pending.get(message.get('nonce', ''))
+                if pending is None:
+                    continue
+
+                done, responses = pending
+                responses.append(message['data'])
+                if len(responses) >= self.cluster_count - 1 and not done.done():
+                    done.set_result(None)
+
+            elif 'nonce' in message and (handler := self.request_handlers.get(op)):
+                answer = await handler(message['data'])
+                await self._send({
+                    'op': 'response',
+                    'data': answer,
+                    'origin': self.cluster_id,
+                    'nonce': message['nonce'],
+                    'to': message['origin'],
+                })
+
+            else:
+                self.bot.dispatch(f'cluster_{op}', message['data'])
+
+        log.warning('Lost the connection to the cluster hub')
+
+    async def close(self) -> None:
+        if self._reader_task:
+            self._reader_task.cancel()
+
+        if self._writer:
+            self._writer.close()
+            with contextlib.suppress(OSError):
+                await self._writer.wait_closed()
@@ -0,0 +1,383 @@
+from __future__ import annotations
+
+import json
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import TYPE_CHECKING
+
+import asyncpg
+
+from config import (
+    DATABASE_MAX_INACTIVE_CONNECTION_LIFETIME,
+    DATABASE_POOL_MAX_SIZE,
+    DATABASE_POOL_MIN_SIZE,
+    DATABASE_STATEMENT_CACHE_SIZE,
+)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+
+    from asyncpg import Record
+    from asyncpg.pool import PoolConnectionProxy
+
+
+__all__ = (
+    'QUERIES',
+    'Database',
+    'QueryStats',
+    'create_pool',
+)
+
+# Every statement the bot runs, by name. The SQL is static so asyncpg prepares each one
+# once per connection and reuses it from the statement cache afterwards.
+QUERIES: MappingProxyType[str, str] = MappingProxyType({
+    # Timers
+    'timers.within': """SELECT * FROM Timers WHERE expires < $1""",
+    'timers.find': """
+        SELECT * FROM Timers
+        WHERE ($1::integer IS NULL OR id = $1)
+            AND ($2::bigint IS NULL OR user_id = $2)
+            AND ($3::integer IS NULL OR reserved_type = $3)
+        ORDER BY expires
+        LIMIT 1
+    """,
+    'timers.insert': """
+        INSERT INTO Timers (user_id, expires, reserved_type, data, recurrence)
+        VALUES ($1, $2, $3, $4, $5)
+        RETURNING *
+    """,
+    # Leases due timers no other process holds a live lease on
+    'timers.claim': """
+        UPDATE Timers
+        SET leased_by = $2, lease_expires = CURRENT_TIMESTAMP + $3::interval
+        WHERE id IN (
+            SELECT id FROM Timers
+            WHERE expires <= $1 AND (lease_expires IS NULL OR lease_expires < CURRENT_TIMESTAMP)
+            ORDER BY expires
+            LIMIT $4
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING *
+    """,
+    # One-shot timers are deleted, recurring timers move to their first occurrence after $3
+    'timers.complete': """
+        WITH fired AS (
+            DELETE FROM Timers
+            WHERE id = ANY($1::integer[]) AND leased_by = $2 AND recurrence IS NULL
+        ),
+        rescheduled AS (
+            UPDATE Timers
+            SET
+                expires = expires + recurrence * (
+                    FLOOR(EXTRACT(EPOCH FROM $3 - expires) / EXTRACT(EPOCH FROM recurrence)) + 1
+                ),
+                leased_by = NULL,
+                lease_expires = NULL
+            WHERE id = ANY($1::integer[]) AND leased_by = $2 AND recurrence IS NOT NULL
+            RETURNING *
+        )
+        SELECT * FROM rescheduled
+    """,
+    'timers.cancel': """
+        DELETE FROM Timers
+        WHERE ($1::integer IS NULL OR id = $1)
+            AND ($2::bigint IS NULL OR user_id = $2)
+            AND ($3::integer IS NULL OR reserved_type = $3)
+        RETURNING id
+    """,
+    'timers.cancel_many': """DELETE FROM Timers WHERE id = ANY($1::integer[]) RETURNING id""",
+    # Prefixes
+    'prefixes.all': """SELECT guild, prefix FROM Prefixes""",
+    'prefixes.by_guild': """SELECT prefix FROM Prefixes WHERE guild = $1""",
+    # Another process may add the same prefix first
+    'prefixes.insert': """INSERT INTO Prefixes (guild, prefix) VALUES ($1, $2) ON CONFLICT DO NOTHING""",
+    'prefixes.delete': """DELETE FROM Prefixes WHERE guild = $1 AND prefix = $2""",
+    'prefixes.notify': """SELECT pg_notify($1, $2)""",
+    # Webhooks
+    'webhooks.all': """SELECT * FROM Webhooks""",
+    'webhooks.insert': """INSERT INTO Webhooks VALUES ($1, $2)""",
+    # Blacklists
+    'blacklists.all': """SELECT * FROM Blacklists""",
+    'blacklists.get': """SELECT * FROM Blacklists WHERE snowflake = $1""",
+    'blacklists.insert': """
+        INSERT INTO Blacklists (snowflake, reason, lasts_until, blacklist_type)
+        VALUES ($1, $2, $3, $4)
+    """,
+    'blacklists.delete': """DELETE FROM Blacklists WHERE snowflake = $1""",
+    # Errors
+    'errors.all': """SELECT * FROM Errors""",
+    'errors.get': """SELECT * FROM Errors WHERE id = $1""",
+    'errors.insert': """
+        INSERT INTO Errors (command, user_id, guild, error, full_error, message_url, occured_when, fixed)
+        VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
+        RETURNING *
+    """,
+    # md5(error) matches the index, the error itself is compared too in case of a collision
+    'errors.find_unfixed': """
+        SELECT * FROM Errors
+        WHERE command = $1 AND md5(error) = md5($2) AND error = $2 AND NOT fixed
+    """,
+    'errors.set_fixed': """UPDATE Errors SET fixed = $1 WHERE id = $2""",
+    'error_reminders.get': """SELECT * FROM ErrorReminders WHERE id = $1 AND user_id = $2""",
+    'error_reminders.by_error': """SELECT user_id FROM ErrorReminders WHERE id = $1""",
+    'error_reminders.insert': """INSERT INTO ErrorReminders (id, user_id) VALUES ($1, $2)""",
+    'error_reminders.delete': """DELETE FROM ErrorReminders WHERE id = $1 AND user_id = $2""",
+    'error_reminders.delete_by_error': """DELETE FROM ErrorReminders WHERE id = $1""",
+    # Waifus
+    'waifus.smash': """
+        INSERT INTO Waifus (id, smashes, nsfw)
+        VALUES ($1, 1, $2)
+        ON CONFLICT (id) DO UPDATE SET smashes = Waifus.smashes + 1
+    """,
+    'waifus.pass': """
+        INSERT INTO Waifus (id, passes, nsfw)
+        VALUES ($1, 1, $2)
+        ON CONFLICT (id) DO UPDATE SET passes = Waifus.passes + 1
+    """,
+    'waifu_favourites.insert': """INSERT INTO WaifuFavourites VALUES ($1, $2, $3, $4)""",
+    'waifu_favourites.delete': """DELETE FROM WaifuFavourites WHERE id = $1 AND user_id = $2 RETURNING id""",
+    'waifu_favourites.by_user': """
+        SELECT * FROM WaifuFavourites
+        WHERE user_id = $1 AND ($2::boolean IS NULL OR nsfw = $2)
+    """,
+    # Gacha
+    # Any amount of cards in one statement, every column is passed as an array
+    'gacha_pulls.insert_batch': """
+        INSERT INTO GachaPulledCards (channel_id, message_id, user_id, card_id, card_name, rarity, pull_source)
+        SELECT * FROM unnest(
+            $1::bigint[], $2::bigint[], $3::bigint[], $4::integer[], $5::text[], $6::integer[], $7::integer[]
+        )
+    """,
+    'gacha_pulls.by_user': """
+        SELECT channel_id, message_id, user_id, card_id, card_name, rarity, pull_source
+        FROM GachaPulledCards
+        WHERE user_id = $1
+    """,
+})
+
+
+@dataclass
+class QueryStats:
+    calls: int = 0
+    errors: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+
+    @property
+    def mean_time(self) -> float:
+        return self.total_time / self.calls if self.calls else 0.0
+
+
+def _json_dumps(obj: object) -> str:
+    return orjson.dumps(obj).decode() if orjson else json.dumps(obj)
+
+
+def _json_loads(data: str) -> object:
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+async def _init_connection(connection: asyncpg.Connection[Record]) -> None:
+    # JSON columns are sent and received as Python objects instead of strings.
+    # orjson is used when installed, it is several times faster than the json module.
+    for name in ('json', 'jsonb'):
+        await connection.set_type_codec(name, encoder=_json_dumps, decoder=_json_loads, schema='pg_catalog')
+
+
+async def create_pool(dsn: str) -> asyncpg.Pool[Record]:
+    """
+    Create the connection pool with the sizes and statement cache from config.py.
+
+    Every connection decodes JSON columns to Python objects and runs in UTC,
+    so naive TIMESTAMP columns and CURRENT_TIMESTAMP agree with each other.
+
+    Parameters
+    ----------
+    dsn : str
+        The connection URI of the database
+
+    Returns
+    -------
+    asyncpg.Pool[Record]
+        The created pool
+
+    """
+    return await asyncpg.create_pool(
+        dsn,
+        min_size=DATABASE_POOL_MIN_SIZE,
+        max_size=DATABASE_POOL_MAX_SIZE,
+        statement_cache_size=DATABASE_STATEMENT_CACHE_SIZE,
+        max_inactive_connection_lifetime=DATABASE_MAX_INACTIVE_CONNECTION_LIFETIME,
+        server_settings={'timezone': 'UTC'},
+        init=_init_connection,
+    )
+
+
+class Database:
+    """
+    Runs the statements in QUERIES by name and records how long each one takes.
+
+    Every method takes an optional connection to run on, for statements which have to
+    share a transaction. Otherwise a connection is taken from the pool.
+    """
+
+    def __init__(self, pool: asyncpg.Pool[Record]) -> None:
+        self.pool = pool
+        self.stats: dict[str, QueryStats] = {name: QueryStats() for name in QUERIES}
+
+        super().__init__()
+
+    def _record(self, name: str, start: float, *, failed: bool) -> None:
+        elapsed = time.perf_counter() - start
+
+        stats = self.stats[name]
+        stats.calls += 1
+        stats.total_time += elapsed
+        stats.max_time = max(stats.max_time, elapsed)
+        if failed:
+            stats.errors += 1
+
+    async def execute(self, name: str, *args: object, connection: PoolConnectionProxy[Record] | None = None) -> str:
+        """
+        Run a statement and return its status.
+
+        Parameters
+        ----------
+        name : str
+            The name of the statement in QUERIES
+        *args : object
+            The arguments of the statement
+        connection : PoolConnectionProxy[Record] | None, optional
+            The connection to run the statement on, by default None
+
+        Returns
+        -------
+        str
+            The status of the statement, for example ``DELETE 1``
+
+        """
+        start = time.perf_counter()
+        failed = True
+        try:
+            result = await (connection or self.pool).execute(QUERIES[name], *args)
+            failed = False
+        finally:
+            self._record(name, start, failed=failed)
+        return result
+
+    async def executemany(
+        self,
+        name: str,
+        args: Iterable[Sequence[object]],
+        *,
+        connection: PoolConnectionProxy[Record] | None = None,
+    ) -> None:
+        """
+        Run a statement once for every set of arguments.
+
+        Parameters
+        ----------
+        name : str
+            The name of the statement in QUERIES
+        args : Iterable[Sequence[object]]
+            The sets of arguments of the statement
+        connection : PoolConnectionProxy[Record] | None, optional
+            The connection to run the statement on, by default None
+
+        """
+        start = time.perf_counter()
+        failed = True
+        try:
+            await (connection or self.pool).executemany(QUERIES[name], args)
+            failed = False
+        finally:
+            self._record(name, start, failed=failed)
+
+    async def fetch(
+        self,
+        name: str,
+        *args: object,
+        connection: PoolConnectionProxy[Record] | None = None,
+    ) -> list[Record]:
+        """
+        Run a statement and return every row.
+
+        Parameters
+        ----------
+        name : str
+            The name of the statement in QUERIES
+        *args : object
+            The arguments of the statement
+        connection : PoolConnectionProxy[Record] | None, optional
+            The connection to run the statement on, by default None
+
+        Returns
+        -------
+        list[Record]
+            The rows returned by the statement
+
+        """
+        start = time.perf_counter()
+        failed = True
+        try:
+            result = await (connection or self.pool).fetch(QUERIES[name], *args)
+            failed = False
+        finally:
+            self._record(name, start, failed=failed)
+        return result
+
+    async def fetchrow(
+        self,
+        name: str,
+        *args: object,
+        connection: PoolConnectionProxy[Record] | None = None,
+    ) -> Record | None:
+        """
+        Run a statement and return its first row.
+
+        Parameters
+        ----------
+        name : str
+            The name of the statement in QUERIES
+        *args : object
+            The arguments of the statement
+        connection : PoolConnectionProxy[Record] | None, optional
+            The connection to run the statement on, by default None
+
+        Returns
+        -------
+        Record | None
+            The first row, None if the statement returned nothing
+
+        """
+        start = time.perf_counter()
+        failed = True
+        try:
+            result = await (connection or self.pool).fetchrow(QUERIES[name], *args)
+            failed = False
+        finally:
+            self._record(name, start, failed=failed)
+        return result
+
+    def hottest(self, limit: int = 10) -> list[tuple[str, QueryStats]]:
+        """
+        Return the statements the most time was spent on.
+
+        Parameters
+        ----------
+        limit : int, optional
+            The amount of statements to return, by default 10
+
+        Returns
+        -------
+        list[tuple[str, QueryStats]]
+            The names and stats of the statements, by total time spent descending
+
+        """
+        called = [(name, stats) for name, stats in self.stats.items() if stats.calls]
+        return sorted(called, key=lambda item: item[1].total_time, reverse=True)[:limit]
@@ -13,6 +13,7 @@ __all__ = (
     'AlreadyBlacklistedError',
     'CyreneError',
     'FeatureDisabledError',
+    'MigrationChecksumError',
     'NotBlacklistedError',
     'PrefixAlreadyPresentError',
     'PrefixNotInitialisedError',
@@ -36,11 +37,14 @@ class PrefixNotInitialisedError(CyreneError):
 
 class PrefixAlreadyPresentError(commands.CommandError, CyreneError):
     def __init__(self, prefix: str) -> None:
-        super().__init__(f"'{prefix} is an already present prefix.'")
+        self.prefix = prefix
+        super().__init__(f"'{prefix}' is an already present prefix.")
 
 
 class PrefixNotPresentError(commands.CommandError, CyreneError):
     def __init__(self, prefix: str, guild: discord.Guild) -> None:
+        self.prefix = prefix
+        self.guild = guild
         super().__init__(f'{prefix} is not present in guild: {guild.id}')
 
 
@@ -66,6 +70,13 @@ class NotBlacklistedError(CyreneError):
         super().__init__(f'{snowflake} is not blacklisted.')
 
 
+class MigrationChecksumError(CyreneError):
+    def __init__(self, version: int, name: str) -> None:
+        self.version = version
+        self.name = name
+        super().__init__(f'Migration {version}_{name} was modified after being applied.')
+
+
 class UnderMaintenanceError(commands.CheckFailure, CyreneError):
     def __init__(self) -> None:
         super().__init__('The bot is currently under maintenance.')
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import asyncio
+    from collections.abc import Callable
+
+
+__all__ = (
+    'EVENT_LOOPS',
+    'loop_factory',
+)
+
+log = logging.getLogger(__name__)
+
+EVENT_LOOPS = ('asyncio', 'uvloop')
+
+
+def loop_factory(name: str) -> Callable[[], asyncio.AbstractEventLoop] | None:
+    """
+    Resolve the factory of an event loop for asyncio.run.
+
+    uvloop falls back to the asyncio event loop when it isn't installed, as it is on Windows.
+
+    Parameters
+    ----------
+    name : str
+        The name of the event loop, one of EVENT_LOOPS
+
+    Returns
+    -------
+    Callable[[], asyncio.AbstractEventLoop] | None
+        The factory of the event loop, None for asyncio's default
+
+    """
+    if name != 'uvloop':
+        return None
+
+    try:
+        import uvloop  # noqa: PLC0415
+    except ImportError:
+        log.warning('uvloop is not installed, falling back to the asyncio event loop.')
+        return None
+
+    return uvloop.new_event_loop
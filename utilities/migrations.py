@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import asyncpg
+
+from utilities.errors import MigrationChecksumError
+
+if TYPE_CHECKING:
+    from asyncpg import Pool, Record
+
+
+__all__ = (
+    'Migration',
+    'apply_migrations',
+    'load_migrations',
+)
+
+log = logging.getLogger(__name__)
+
+MIGRATIONS_PATH = Path('migrations')
+MIGRATION_FILE_REGEX = re.compile(r'(?P<version>[0-9]+)_(?P<name>[a-z0-9_]+)\.sql')
+
+# Serialises migration runs of several processes sharing a database
+MIGRATION_LOCK_ID = 0x43_79_72_65_6E_65
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    sql: str
+
+    @property
+    def checksum(self) -> str:
+        return hashlib.sha256(self.sql.encode()).hexdigest()
+
+
+def load_migrations(path: Path = MIGRATIONS_PATH) -> list[Migration]:
+    """
+    Read all migrations from the migrations directory.
+
+    Parameters
+    ----------
+    path : Path, optional
+        The directory containing the migrations, by default ``migrations``
+
+    Returns
+    -------
+    list[Migration]
+        The migrations sorted by their version
+
+    """
+    migrations: list[Migration] = []
+
+    for file in path.iterdir():
+        match = MIGRATION_FILE_REGEX.fullmatch(file.name)
+        if not match:
+            continue
+
+        migrations.append(
+            Migration(
+                int(match['version']),
+                match['name'],
+                file.read_text(encoding='utf-8'),
+            )
+        )
+
+    return sorted(migrations, key=lambda m: m.version)
+
+
+async def _fetch_applied(connection: asyncpg.pool.PoolConnectionProxy[Record]) -> dict[int, str]:
+    records = await connection.fetch("""SELECT version, checksum FROM schema_version""")
+    return {record['version']: record['checksum'] for record in records}
+
+
+def _pending(migrations: list[Migration], applied: dict[int, str]) -> list[Migration]:
+    pending: list[Migration] = []
+
+    for migration in migrations:
+        checksum = applied.get(migration.version)
+
+        if checksum is None:
+            pending.append(migration)
+        elif checksum != migration.checksum:
+            raise MigrationChecksumError(migration.version, migration.name)
+
+    return pending
+
+
+async def apply_migrations(pool: Pool[Record], *, path: Path = MIGRATIONS_PATH) -> list[Migration]:
+    """
+    Apply every migration which has not been applied to the database yet.
+
+    A warm start where everything is up to date costs a single query.
+    A MigrationChecksumError is raised if an applied migration was modified afterwards.
+
+    Parameters
+    ----------
+    pool : Pool[Record]
+        The pool of the database being migrated
+    path : Path, optional
+        The directory containing the migrations, by default ``migrations``
+
+    Returns
+    -------
+    list[Migration]
+        The migrations which were applied
+
+    """
+    migrations = load_migrations(path)
+
+    async with pool.acquire() as connection:
+        try:
+            applied = await _fetch_applied(connection)
+        except asyncpg.UndefinedTableError:
+            applied = {}
+
+        if not _pending(migrations, applied):
+            return []
+
+        await connection.execute("""SELECT pg_advisory_lock($1)""", MIGRATION_LOCK_ID)
+        try:
+            await connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS schema_version (
+                        version INTEGER PRIMARY KEY,
+                        name TEXT NOT NULL,
+                        checksum TEXT NOT NULL,
+                        applied_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP
+                );
+                """
+            )
+
+            # Another process might have applied them while we waited for the lock
+            pending = _pending(migrations, await _fetch_applied(connection))
+
+            for migration in pending:
+                async with connection.transaction():
+                    await connection.execute(migration.sql)
+                    await connection.execute(
+                        """INSERT INTO schema_version (version, name, checksum) VALUES ($1, $2, $3)""",
+                        migration.version,
+                        migration.name,
+                        migration.checksum,
+                    )
+
+                log.info('Applied migration %s_%s', migration.version, migration.name)
+
+        finally:
+            await connection.execute("""SELECT pg_advisory_unlock($1)""", MIGRATION_LOCK_ID)
+
+    return pending
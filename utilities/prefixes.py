@@ -0,0 +1,307 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import uuid
+from typing import TYPE_CHECKING, Any
+
+from utilities.errors import PrefixAlreadyPresentError, PrefixNotPresentError
+
+if TYPE_CHECKING:
+    from collections.abc import Coroutine, Iterable
+
+    import asyncpg
+    import discord
+
+    from utilities.bases.bot import Cyrene
+
+
+__all__ = (
+    'PrefixManager',
+    'PrefixMatcher',
+    'normalise_prefix',
+)
+
+log = logging.getLogger(__name__)
+
+type _Node = dict[str, _Node]
+
+_TERMINAL = ''  # Never a single character, so it can't collide with a trie edge
+
+
+def _fold(char: str) -> str:
+    return char.lower()
+
+
+def normalise_prefix(prefix: str) -> str:
+    """
+    Normalise a prefix the way PrefixMatcher compares them, a character at a time.
+
+    Parameters
+    ----------
+    prefix : str
+        The prefix to be normalised
+
+    Returns
+    -------
+    str
+        The prefix as two prefixes matching the same messages normalise to
+
+    """
+    return ''.join(_fold(char) for char in prefix)
+
+
+class PrefixMatcher:
+    """
+    Case-insensitive prefix matcher backed by a trie.
+
+    The trie is keyed on lowercased characters, so a message is matched in a single
+    walk over its first few characters instead of comparing it against every
+    upper/lower-case permutation of every prefix.
+    """
+
+    __slots__ = ('_root', 'prefixes')
+
+    def __init__(self, prefixes: Iterable[str]) -> None:
+        self.prefixes: tuple[str, ...] = tuple(dict.fromkeys(p for p in prefixes if p))
+        self._root: _Node = {}
+
+        for prefix in self.prefixes:
+            node = self._root
+            for char in prefix:
+                node = node.setdefault(_fold(char), {})
+            node[_TERMINAL] = {}
+
+        super().__init__()
+
+    def __repr__(self) -> str:
+        return f'<PrefixMatcher prefixes={self.prefixes!r}>'
+
+    def match(self, content: str) -> str | None:
+        """
+        Match the longest prefix the content starts with.
+
+        Parameters
+        ----------
+        content : str
+            The content to be matched, usually a message's content
+
+        Returns
+        -------
+        str | None
+            The prefix as it is written in the content, None if no prefix matched
+
+        """
+        node = self._root
+        end = 0
+
+        for index, char in enumerate(content):
+            next_node = node.get(_fold(char))
+            if next_node is None:
+                break
+
+            node = next_node
+            if _TERMINAL in node:
+                end = index + 1
+
+        return content[:end] if end else None
+
+
+class PrefixManager:
+    """
+    Keeps Cyrene.prefixes in sync with the Prefixes table.
+
+    Every row is loaded in one query on start, writes go through to the cache and
+    other processes are told to refresh the guild through LISTEN/NOTIFY. Resolving
+    the prefix of a message never touches the database.
+    """
+
+    CHANNEL = 'cyrene_prefixes'
+    MAX_RECONNECT_DELAY = 60.0
+
+    def __init__(self, bot: Cyrene) -> None:
+        self.bot = bot
+        self.origin = uuid.uuid4().hex
+
+        self._connection: asyncpg.pool.PoolConnectionProxy[asyncpg.Record] | None = None
+        self._tasks: set[asyncio.Task[None]] = set()
+
+        super().__init__()
+
+    async def start(self) -> None:
+        await self.load()
+        await self.listen()
+
+    async def load(self) -> None:
+        """Fill the prefix cache with every row of the Prefixes table."""
+        records = await self.bot.db.fetch('prefixes.all')
+
+        prefixes: dict[int, list[str]] = {}
+        for record in records:
+            prefixes.setdefault(record['guild'], []).append(record['prefix'])
+
+        self.bot.prefixes = prefixes
+        self.bot.invalidate_all_prefix_matchers()
+
+    async def refresh(self, guild_id: int) -> None:
+        """
+        Reload the prefixes of a single guild from the database.
+
+        Parameters
+        ----------
+        guild_id : int
+            The ID of the guild to be reloaded
+
+        """
+        records = await self.bot.db.fetch('prefixes.by_guild', guild_id)
+
+        if records:
+            self.bot.prefixes[guild_id] = [record['prefix'] for record in records]
+        else:
+            self.bot.prefixes.pop(guild_id, None)
+
+        self.bot.invalidate_prefix_matcher(guild_id)
+
+    async def add(self, guild: discord.Guild, prefix: str) -> list[str]:
+        """
+        Add a prefix to a guild.
+
+        This adds the prefix to the database as well as cache
+
+        Parameters
+        ----------
+        guild : discord.Guild
+            The guild the prefix is being added to
+        prefix : str
+            The prefix being added
+
+        Returns
+        -------
+        list[str]
+            The prefixes of the guild after the addition
+
+        Raises
+        ------
+        PrefixAlreadyPresentError
+            Raised when the guild already has this prefix, ignoring case
+
+        """
+        current = self.bot.prefixes.get(guild.id, [])
+        if any(normalise_prefix(p) == normalise_prefix(prefix) for p in current):
+            raise PrefixAlreadyPresentError(prefix)
+
+        async with self.bot.pool.acquire() as connection, connection.transaction():
+            await self.bot.db.execute('prefixes.insert', guild.id, prefix, connection=connection)
+            await self._notify(connection, guild.id)
+
+        prefixes = self.bot.prefixes[guild.id] = [*current, prefix]
+        self.bot.invalidate_prefix_matcher(guild.id)
+        return prefixes
+
+    async def remove(self, guild: discord.Guild, prefix: str) -> list[str]:
+        """
+        Remove a prefix from a guild.
+
+        This removes the prefix from the database as well as cache.
+        A guild left without prefixes falls back to the base prefix.
+
+        Parameters
+        ----------
+        guild : discord.Guild
+            The guild the prefix is being removed from
+        prefix : str
+            The prefix being removed
+
+        Returns
+        -------
+        list[str]
+            The prefixes of the guild after the removal
+
+        Raises
+        ------
+        PrefixNotPresentError
+            Raised when the guild does not have this prefix, ignoring case
+
+        """
+        current = self.bot.prefixes.get(guild.id, [])
+        # Matched ignoring case like add and the matcher, the prefix is removed as it is stored
+        stored = next((p for p in current if normalise_prefix(p) == normalise_prefix(prefix)), None)
+        if stored is None:
+            raise PrefixNotPresentError(prefix, guild)
+
+        async with self.bot.pool.acquire() as connection, connection.transaction():
+            await self.bot.db.execute('prefixes.delete', guild.id, stored, connection=connection)
+            await self._notify(connection, guild.id)
+
+        prefixes = [p for p in current if p != stored]
+        if prefixes:
+            self.bot.prefixes[guild.id] = prefixes
+        else:
+            self.bot.prefixes.pop(guild.id, None)
+
+        self.bot.invalidate_prefix_matcher(guild.id)
+        return prefixes
+
+    async def listen(self) -> None:
+        """Hold a connection which listens for prefix changes made by other processes."""
+        connection = await self.bot.pool.acquire()
+        try:
+            await connection.add_listener(self.CHANNEL, self._on_notification)
+        except BaseException:
+            await self.bot.pool.release(connection)
+            raise
+
+        connection.add_termination_listener(self._on_termination)
+        self._connection = connection
+
+    async def _notify(self, connection: asyncpg.pool.PoolConnectionProxy[asyncpg.Record], guild_id: int) -> None:
+        payload = json.dumps({'guild': guild_id, 'origin': self.origin})
+        await self.bot.db.execute('prefixes.notify', self.CHANNEL, payload, connection=connection)
+
+    def _on_notification(self, _: object, __: int, ___: str, payload: str) -> None:
+        data = json.loads(payload)
+        if data['origin'] == self.origin:
+            return  # Our own write, the cache is already up to date
+
+        self._spawn(self.refresh(data['guild']))
+
+    def _on_termination(self, _: object) -> None:
+        # Changes could have been missed while disconnected, so everything is reloaded
+        log.warning('Lost the prefix listener connection, reconnecting.')
+        connection, self._connection = self._connection, None
+        self._spawn(self._reconnect(connection))
+
+    async def _reconnect(self, connection: asyncpg.pool.PoolConnectionProxy[asyncpg.Record] | None) -> None:
+        if connection is not None:
+            await self.bot.pool.release(connection)
+
+        # Postgres is often still restarting when the connection drops, so this retries until it is back
+        delay = 1.0
+        while not self.bot.is_closed():
+            try:
+                if self._connection is None:
+                    await self.listen()
+                await self.load()
+            except Exception as error:
+                log.warning('Could not re-establish the prefix listener, retrying in %.0fs', delay, exc_info=error)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.MAX_RECONNECT_DELAY)
+            else:
+                log.info('Re-established the prefix listener.')
+                return
+
+    def _spawn(self, coro: Coroutine[Any, Any, None]) -> None:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def close(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+
+        if self._connection is not None:
+            connection, self._connection = self._connection, None
+            connection.remove_termination_listener(self._on_termination)
+            await connection.remove_listener(self.CHANNEL, self._on_notification)
+            await self.bot.pool.release(connection)
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import builtins
+import contextlib
+import json
+import logging
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Generator, Mapping, Sequence
+    from types import FrameType, ModuleType
+
+
+# This module is imported before anything heavy so it can time those imports.
+# Keep its imports to the standard library.
+
+__all__ = (
+    'StartupProfiler',
+    'startup_profiler',
+)
+
+log = logging.getLogger(__name__)
+
+WATCHED_IMPORTS = frozenset({'discord', 'jishaku', 'PIL', 'git', 'psutil', 'mystbin', 'asyncpg', 'aiohttp'})
+
+
+class StackSampler(threading.Thread):
+    """Samples the stack of a thread and counts it in the collapsed format flame graph tools read."""
+
+    def __init__(self, thread_id: int, interval: float) -> None:
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._stopped = threading.Event()
+
+        super().__init__(name='startup-stack-sampler', daemon=True)
+
+    def run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[self._collapse(frame)] += 1
+
+    def _collapse(self, frame: FrameType | None) -> str:
+        names: list[str] = []
+        while frame is not None:
+            code = frame.f_code
+            names.append(f'{code.co_qualname} ({Path(code.co_filename).name}:{frame.f_lineno})')
+            frame = frame.f_back
+        return ';'.join(reversed(names))
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+
+class StartupProfiler:
+    """
+    Records where the time between process start and every shard being ready goes.
+
+    Everything is a no-op until the profiler is enabled.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.output = Path('startup-profile.json')
+
+        self.imports: dict[str, float] = {}
+        self.spans: dict[str, float] = {}
+        self.marks: dict[str, float] = {}
+
+        self._origin = time.perf_counter()
+        self._original_import = builtins.__import__
+        self._sampler: StackSampler | None = None
+
+        super().__init__()
+
+    def enable(self) -> None:
+        """Start profiling and time the first import of the watched modules."""
+        if self.enabled:
+            return
+
+        self.enabled = True
+        builtins.__import__ = self._timed_import
+
+    def start_sampling(self, interval: float) -> None:
+        """
+        Sample the main thread's stack until the profiler finishes.
+
+        Parameters
+        ----------
+        interval : float
+            Seconds between samples
+
+        """
+        if not self.enabled or self._sampler:
+            return
+
+        self._sampler = StackSampler(threading.main_thread().ident or 0, interval)
+        self._sampler.start()
+
+    def _timed_import(
+        self,
+        name: str,
+        globals: Mapping[str, object] | None = None,
+        locals: Mapping[str, object] | None = None,
+        fromlist: Sequence[str] = (),
+        level: int = 0,
+    ) -> ModuleType:
+        top_level = name.partition('.')[0]
+        if level or top_level not in WATCHED_IMPORTS or top_level in sys.modules:
+            return self._original_import(name, globals, locals, fromlist, level)
+
+        start = time.perf_counter()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            self.imports[top_level] = time.perf_counter() - start
+
+    @contextlib.contextmanager
+    def span(self, name: str) -> Generator[None]:
+        """
+        Time the wrapped block.
+
+        Parameters
+        ----------
+        name : str
+            The name the block's time is reported under
+
+        """
+        if not self.enabled:
+            yield
+            return
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.spans[name] = time.perf_counter() - start
+
+    def mark(self, name: str) -> None:
+        """
+        Record the time since the profiler was created.
+
+        Parameters
+        ----------
+        name : str
+            The name of the point in time, for example a shard becoming ready
+
+        """
+        if self.enabled:
+            self.marks[name] = time.perf_counter() - self._origin
+
+    def finish(self, *, extensions: Mapping[str, Any] | None = None) -> None:
+        """
+        Stop profiling and write the report.
+
+        Parameters
+        ----------
+        extensions : Mapping[str, Any] | None, optional
+            Per extension timings to include, by default None
+
+        """
+        if not self.enabled:
+            return
+
+        self.enabled = False
+        builtins.__import__ = self._original_import
+
+        report: dict[str, Any] = {
+            'total': time.perf_counter() - self._origin,
+            'imports': self.imports,
+            'spans': self.spans,
+            'marks': self.marks,
+            'extensions': {name: vars(timing) for name, timing in (extensions or {}).items()},
+        }
+        self.output.write_text(json.dumps(report, indent=4), encoding='utf-8')
+        log.info('Wrote the startup profile to %s', self.output)
+
+        if self._sampler:
+            self._sampler.stop()
+            stacks = self.output.with_suffix('.folded')
+            stacks.write_text(
+                '\n'.join(f'{stack} {count}' for stack, count in self._sampler.stacks.items()),
+                encoding='utf-8',
+            )
+            log.info('Wrote the startup stack samples to %s', stacks)
+
+
+startup_profiler = StartupProfiler()
@@ -1,42 +1,104 @@
 from __future__ import annotations
 
 import asyncio
+import bisect
+import dataclasses
 import datetime
 import enum
+import functools
+import heapq
+import itertools
+import logging
+import math
+import time
+import uuid
 from asyncio import AbstractEventLoop
+from collections import Counter, deque
 from typing import TYPE_CHECKING, Any, Self
 
 import asyncpg
-import discord
+
+from config import TIMER_CATCH_UP_CONCURRENCY, TIMER_CATCH_UP_RATE, TIMER_COALESCE_STALE, TIMER_STALE_AFTER
 
 if TYPE_CHECKING:
+    from collections.abc import Coroutine, Iterable, Iterator
+
+    import discord
+
     from utilities.bases.bot import Cyrene
+    from utilities.database import Database
 
 
 __all__ = (
+    'TIMER_PAYLOADS',
+    'AnicordGachaPayload',
     'ReservedTimerType',
     'Timer',
+    'TimerBatch',
     'TimerManager',
+    'TimerMetrics',
+    'TimingWheel',
 )
 
+log = logging.getLogger(__name__)
+
 
 class ReservedTimerType(enum.IntEnum):
     ANICORD_GACHA = 1
 
 
+@dataclasses.dataclass(frozen=True)
+class AnicordGachaPayload:
+    channel_id: int
+
+    @classmethod
+    def from_data(cls, data: dict[str, Any]) -> Self:
+        return cls(channel_id=int(data['channel_id']))
+
+
+type TimerPayload = AnicordGachaPayload
+
+# The payload each reserved type's data is built into
+TIMER_PAYLOADS: dict[int, type[TimerPayload]] = {
+    ReservedTimerType.ANICORD_GACHA: AnicordGachaPayload,
+}
+
+
 class Timer:
-    def __init__(self, data: asyncpg.Record) -> None:
+    def __init__(self, data: asyncpg.Record | dict[str, Any]) -> None:
         self.id: int = data['id']
         self.user_id: int = data['user_id']
         self.reserved_type: int | None = data['reserved_type']
         self.expires: datetime.datetime = data['expires']
+        self.data: dict[str, Any] | None = data['data']  # Decoded by the pool's JSONB codec
+        self.recurrence: datetime.timedelta | None = data['recurrence']
 
         super().__init__()
 
+    @functools.cached_property
+    def payload(self) -> TimerPayload | dict[str, Any] | None:
+        """
+        The data of the timer as the payload of its reserved type.
+
+        The payload is only built on first access. Timers without a reserved type
+        return their data as is.
+
+        Returns
+        -------
+        TimerPayload | dict[str, Any] | None
+            The payload, None if the timer has no data
+
+        """
+        if self.data is None:
+            return None
+
+        payload_type = TIMER_PAYLOADS.get(self.reserved_type) if self.reserved_type is not None else None
+        return payload_type.from_data(self.data) if payload_type else self.data
+
     @classmethod
     async def from_fetched_record(
         cls,
-        pool: asyncpg.Pool[asyncpg.Record],
+        db: Database,
         *,
         id: int | None = None,
         user: discord.User | discord.Member | None = None,
@@ -45,101 +107,466 @@ class Timer:
         if id is None and user is None and reserved_type is None:
             raise TypeError('Expected at least one of the kwargs.')
 
-        query = 'SELECT * FROM Timers WHERE '
+        record = await db.fetchrow('timers.find', id, user.id if user else None, reserved_type)
+        if not record:
+            return None
+        return cls(record)
 
-        params: list[str] = []
-        args: list[Any] = []
 
-        if id:
-            params.append(f'id = ${len(params) + 1}')
-            args.append(id)
+class TimingWheel:
+    """
+    Holds process-local timers in slots by the tick they expire on.
 
-        if user:
-            params.append(f'user_id = ${len(params) + 1}')
-            args.append(user.id)
+    Adding and removing a timer is O(1) and every tick only looks at one slot. Timers further
+    away than a full turn of the wheel share their slot with nearer ones and are left in it
+    until the tick they expire on comes around.
+    """
 
-        if reserved_type:
-            params.append(f'reserved_type = ${len(params) + 1}')
-            args.append(reserved_type)
+    def __init__(self, resolution: float, size: int) -> None:
+        self.resolution = resolution
+        self.size = size
 
-        query += ' AND '.join(params) + ' ORDER BY expires LIMIT 1'
+        self._slots: list[dict[int, Timer]] = [{} for _ in range(size)]
+        self._ticks: dict[int, int] = {}
+        self._cursor = self._tick(datetime.datetime.now(tz=datetime.UTC))
 
-        record = await pool.fetchrow(
-            query,
-            *args,
-        )
-        if not record:
+        super().__init__()
+
+    def __len__(self) -> int:
+        return len(self._ticks)
+
+    def __iter__(self) -> Iterator[Timer]:
+        for timer_id, tick in self._ticks.items():
+            yield self._slots[tick % self.size][timer_id]
+
+    def _tick(self, when: datetime.datetime) -> int:
+        return math.floor(when.timestamp() / self.resolution)
+
+    def add(self, timer: Timer) -> None:
+        # Timers already due go in the next slot to be looked at
+        tick = max(math.ceil(timer.expires.timestamp() / self.resolution), self._cursor)
+        self._slots[tick % self.size][timer.id] = timer
+        self._ticks[timer.id] = tick
+
+    def remove(self, timer_id: int) -> Timer | None:
+        tick = self._ticks.pop(timer_id, None)
+        if tick is None:
             return None
-        return cls(record)
+        return self._slots[tick % self.size].pop(timer_id)
+
+    def advance(self, now: datetime.datetime) -> list[Timer]:
+        """
+        Turn the wheel up to now and take out every timer which expired.
+
+        Parameters
+        ----------
+        now : datetime.datetime
+            The time to turn the wheel to
+
+        Returns
+        -------
+        list[Timer]
+            The expired timers
+
+        """
+        end = self._tick(now)
+        expired: list[Timer] = []
+
+        # A full turn looks at every slot, so nothing is missed after the wheel was idle
+        for tick in range(self._cursor, min(end, self._cursor + self.size - 1) + 1):
+            slot = self._slots[tick % self.size]
+            for timer_id in [timer_id for timer_id in slot if self._ticks[timer_id] <= end]:
+                del self._ticks[timer_id]
+                expired.append(slot.pop(timer_id))
+
+        self._cursor = max(self._cursor, end + 1)
+        return expired
+
+
+@dataclasses.dataclass
+class TimerBatch:
+    size: int
+    max_lateness: float = 0.0
+    total_lateness: float = 0.0
+    duration: float = 0.0
+
+    @property
+    def mean_lateness(self) -> float:
+        return self.total_lateness / self.size if self.size else 0.0
+
+
+class LatenessHistogram:
+    """Counts how late timers fire in buckets bounded by BOUNDS, in seconds."""
+
+    BOUNDS = (0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0, 60.0, 300.0)
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(self.BOUNDS) + 1)  # The last bucket is everything later than the last bound
+        self.total = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+        super().__init__()
+
+    def record(self, lateness: float) -> None:
+        self.counts[bisect.bisect_left(self.BOUNDS, lateness)] += 1
+        self.total += 1
+        self.sum += lateness
+        self.max = max(self.max, lateness)
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.total if self.total else 0.0
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a quantile as the upper bound of the bucket it falls in.
+
+        Parameters
+        ----------
+        q : float
+            The quantile, between 0 and 1
+
+        Returns
+        -------
+        float
+            The estimated lateness in seconds, the max for the unbounded bucket
+
+        """
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= q * self.total:
+                return self.BOUNDS[index] if index < len(self.BOUNDS) else self.max
+        return 0.0
+
+
+@dataclasses.dataclass
+class TimerMetrics:
+    lateness: LatenessHistogram = dataclasses.field(default_factory=LatenessHistogram)
+    restarts: Counter[str] = dataclasses.field(default_factory=Counter)
+    recent_restarts: deque[tuple[datetime.datetime, str, float]] = dataclasses.field(
+        default_factory=lambda: deque(maxlen=10)
+    )
+    backoff_time: float = 0.0
+
+    def record_restart(self, reason: str, detail: str | None = None, delay: float = 0.0) -> None:
+        self.restarts[reason] += 1
+        self.recent_restarts.append((datetime.datetime.now(tz=datetime.UTC), detail or reason, delay))
+        self.backoff_time += delay
 
 
 class TimerManager:
+    """
+    Schedules the timers stored in the Timers table.
+
+    Timers expiring within the horizon are held in a min-heap. The heap is loaded in one
+    query and kept in sync as timers are created, so the database is only asked again once
+    the horizon is reached. Postgres stays the durable store of every timer.
+
+    Timers due together are leased in one statement and fired concurrently. Their
+    ``on_timer_expire`` listeners are awaited, at most MAX_CONCURRENT_FIRES at a time.
+    Once fired, one-shot timers are deleted and recurring timers move to their next
+    occurrence in place.
+
+    Several processes can share the table. Leases are taken with SKIP LOCKED, so every
+    timer is fired by one of them, and a timer whose process died before completing it
+    is fired again once its lease runs out. Every SWEEP_INTERVAL the table is checked
+    for due timers which aren't in this process' heap, such as those created elsewhere.
+
+    Whenever the dispatcher starts, the timers which came due while it wasn't running are
+    replayed first, at the concurrency and rate set in config.py. It waits for the bot to be
+    ready before that, so the listeners of every extension are registered. After any error
+    it is restarted with a delay, doubled for every failure in a row up to MAX_RESTART_DELAY.
+
+    Timers which aren't persisted never touch the database. They are held in a timing wheel
+    with negative IDs, fire through the same listeners and are lost when the process exits.
+    """
+
+    HORIZON = datetime.timedelta(days=40)
+    BATCH_TOLERANCE = datetime.timedelta(seconds=1)
+    MAX_CONCURRENT_FIRES = 50
+    CLAIM_LIMIT = 500
+    LEASE_DURATION = datetime.timedelta(minutes=5)
+    SWEEP_INTERVAL = datetime.timedelta(minutes=1)
+    RESTART_DELAY = 1.0
+    MAX_RESTART_DELAY = 60.0
+    EPHEMERAL_THRESHOLD = datetime.timedelta(seconds=30)
+    WHEEL_RESOLUTION = 0.1
+    WHEEL_SIZE = 512
+
     def __init__(self, loop: AbstractEventLoop, bot: Cyrene) -> None:
         self.loop = loop
         self.bot = bot
-
-        self.task = self.loop.create_task(self.dispatch_timers())
-        self._have_data = asyncio.Event()
+        self.worker_id = uuid.uuid4().hex
 
         self.current: Timer | None = None
 
+        self._heap: list[tuple[datetime.datetime, int]] = []
+        self._timers: dict[int, Timer] = {}
+        self._window_end: datetime.datetime | None = None
+        self._changed = asyncio.Event()
+        self._failures = 0
+
+        self.batches: deque[TimerBatch] = deque(maxlen=100)
+        self.metrics = TimerMetrics()
+        self._fire_semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_FIRES)
+        self._fire_tasks: set[asyncio.Task[None]] = set()
+
+        self._wheel = TimingWheel(self.WHEEL_RESOLUTION, self.WHEEL_SIZE)
+        self._wheel_task: asyncio.Task[None] | None = None
+        self._ephemeral_ids = itertools.count(-1, -1)
+
+        self.task = self.loop.create_task(self.dispatch_timers())
+
         super().__init__()
 
-    async def dispatch_timers(self) -> None:
+    async def load(self) -> None:
+        """Add every timer expiring within the horizon to the heap."""
+        window_end = datetime.datetime.now(tz=datetime.UTC) + self.HORIZON
+        records = await self.bot.db.fetch('timers.within', window_end)
+
+        for record in records:
+            timer = Timer(record)
+            self._timers[timer.id] = timer
+            self._heap.append((timer.expires, timer.id))
+
+        heapq.heapify(self._heap)
+        self._window_end = window_end
+
+    def _schedule(self, timer: Timer) -> None:
+        self._timers[timer.id] = timer
+        heapq.heappush(self._heap, (timer.expires, timer.id))
+
+        if self._heap[0][1] == timer.id:
+            self._changed.set()  # The dispatcher is sleeping towards a later timer
+
+    def _next_timer(self) -> Timer | None:
+        while self._heap:
+            timer = self._timers.get(self._heap[0][1])
+            if timer is not None:
+                return timer
+
+            heapq.heappop(self._heap)  # Already fired, a duplicate from a reload
+
+        return None
+
+    async def _sleep_until(self, when: datetime.datetime) -> bool:
+        # False when woken early because an earlier timer was scheduled
+        self._changed.clear()
+
+        delay = (when - datetime.datetime.now(tz=datetime.UTC)).total_seconds()
+        if delay <= 0:
+            return True
+
         try:
-            while not self.bot.is_closed():
-                data = await self.wait_for_active_timer()
+            await asyncio.wait_for(self._changed.wait(), timeout=delay)
+        except TimeoutError:
+            return True
+        return False
+
+    async def dispatch_timers(self, delay: float = 0.0) -> None:
+        await self.bot.wait_until_ready()
 
-                self.current = Timer(data)
+        try:
+            await asyncio.sleep(delay)  # Backing off after connection errors
 
-                now = datetime.datetime.now(tz=datetime.UTC)
+            await self.catch_up()
+            await self.load()
+            self._failures = 0
+
+            while not self.bot.is_closed():
+                assert self._window_end is not None
 
-                if self.current.expires >= now:
-                    to_sleep = (self.current.expires - now).total_seconds()
+                self.current = timer = self._next_timer()
+                sweep = datetime.datetime.now(tz=datetime.UTC) + self.SWEEP_INTERVAL
 
-                    await asyncio.sleep(to_sleep)
+                if not await self._sleep_until(min(timer.expires if timer else self._window_end, sweep)):
+                    continue
 
-                await self.call_timer(self.current)
+                if datetime.datetime.now(tz=datetime.UTC) >= self._window_end:
+                    await self.load()
+
+                await self.call_timers()
 
         except asyncio.CancelledError:
             raise
 
-        except (OSError, discord.ConnectionClosed, asyncpg.PostgresConnectionError):
-            self.restart_task()
+        except Exception as error:
+            # Postgres restarting or failing over raises more than connection errors, the dispatcher can't stop for any
+            delay = min(self.RESTART_DELAY * 2**self._failures, self.MAX_RESTART_DELAY)
+            self._failures += 1
+
+            log.warning('Timer dispatcher failed, restarting it in %.1fs', delay, exc_info=error)
+            self.restart_task(type(error).__name__, detail=f'{type(error).__name__}: {error}', delay=delay)
+
+    async def catch_up(self) -> None:
+        """Replay every overdue timer, coalescing stale ones, at the configured concurrency and rate."""
+        start = time.perf_counter()
+        replayed = coalesced = 0
+
+        # Paced at the rate, a claim must be replayed well within its lease or another process claims it again
+        limit = self.CLAIM_LIMIT
+        if TIMER_CATCH_UP_RATE > 0:
+            limit = max(min(limit, int(TIMER_CATCH_UP_RATE * self.LEASE_DURATION.total_seconds() * 0.8)), 1)
+
+        while True:
+            cutoff = datetime.datetime.now(tz=datetime.UTC)
+            records = await self.bot.db.fetch('timers.claim', cutoff, self.worker_id, self.LEASE_DURATION, limit)
+            if not records:
+                break
+
+            timers = [Timer(record) for record in records]
+            to_fire = self._coalesce(timers) if TIMER_COALESCE_STALE else timers
+
+            await self._replay(to_fire)
+            await self.bot.db.fetch('timers.complete', [timer.id for timer in timers], self.worker_id, cutoff)
+
+            replayed += len(to_fire)
+            coalesced += len(timers) - len(to_fire)
+
+        if replayed or coalesced:
+            log.info(
+                'Caught up on %s overdue timers in %.3fs, %s stale timers were coalesced',
+                replayed,
+                time.perf_counter() - start,
+                coalesced,
+            )
+
+    def _coalesce(self, timers: list[Timer]) -> list[Timer]:
+        # Stale timers of a reserved type only fire once per user and type, for the latest of them
+        stale_before = datetime.datetime.now(tz=datetime.UTC) - datetime.timedelta(seconds=TIMER_STALE_AFTER)
+
+        to_fire: list[Timer] = []
+        latest: dict[tuple[int, int], Timer] = {}
+
+        for timer in timers:
+            if timer.reserved_type is None or timer.expires >= stale_before:
+                to_fire.append(timer)
+                continue
+
+            key = (timer.user_id, timer.reserved_type)
+            if key not in latest or timer.expires > latest[key].expires:
+                latest[key] = timer
+
+        return to_fire + list(latest.values())
+
+    async def _replay(self, timers: list[Timer]) -> None:
+        batch = TimerBatch(size=len(timers))
+        self.batches.append(batch)
+
+        semaphore = asyncio.Semaphore(TIMER_CATCH_UP_CONCURRENCY)
+        interval = 1 / TIMER_CATCH_UP_RATE if TIMER_CATCH_UP_RATE > 0 else 0
+
+        async def replay(timer: Timer) -> None:
+            try:
+                await self._fire(batch, timer)
+            finally:
+                semaphore.release()
+
+        tasks: list[asyncio.Task[None]] = []
+        for timer in timers:
+            await semaphore.acquire()
+            tasks.append(asyncio.create_task(replay(timer)))
+            await asyncio.sleep(interval)
+
+        await asyncio.gather(*tasks)
+
+    async def call_timers(self) -> None:
+        """Lease every timer due within the batch tolerance and fire them together."""
+        cutoff = datetime.datetime.now(tz=datetime.UTC) + self.BATCH_TOLERANCE
+
+        # Timers leased by another process are theirs to fire, so the heap forgets them too
+        while self._heap and self._heap[0][0] <= cutoff:
+            _, timer_id = heapq.heappop(self._heap)
+            self._timers.pop(timer_id, None)
+
+        while True:
+            records = await self.bot.db.fetch(
+                'timers.claim',
+                cutoff,
+                self.worker_id,
+                self.LEASE_DURATION,
+                self.CLAIM_LIMIT,
+            )
+
+            if records:
+                batch = TimerBatch(size=len(records))
+                self.batches.append(batch)
+                self._spawn(self._fire_batch(batch, [Timer(record) for record in records], cutoff))
+
+            if len(records) < self.CLAIM_LIMIT:
+                break
+
+    async def _fire_batch(self, batch: TimerBatch, timers: list[Timer], cutoff: datetime.datetime) -> None:
+        start = time.perf_counter()
+        await asyncio.gather(*(self._fire(batch, timer) for timer in timers))
+        batch.duration = time.perf_counter() - start
+
+        try:
+            rescheduled = await self.bot.db.fetch('timers.complete', [timer.id for timer in timers], self.worker_id, cutoff)
+        except (OSError, asyncpg.PostgresError):
+            log.warning('Could not complete %s fired timers, they fire again once their lease runs out', batch.size)
+            return
+
+        horizon = datetime.datetime.now(tz=datetime.UTC) + self.HORIZON
+        for record in rescheduled:
+            if record['expires'] < horizon:
+                self._schedule(Timer(record))
+
+        log.debug(
+            'Fired %s timers in %.3fs, %.3fs late on average and %.3fs at most',
+            batch.size,
+            batch.duration,
+            batch.mean_lateness,
+            batch.max_lateness,
+        )
+
+    async def _fire(self, batch: TimerBatch, timer: Timer) -> None:
+        async with self._fire_semaphore:
+            # Timers are leased up to BATCH_TOLERANCE early, which counts as on time
+            lateness = max((datetime.datetime.now(tz=datetime.UTC) - timer.expires).total_seconds(), 0.0)
+            batch.total_lateness += lateness
+            batch.max_lateness = max(batch.max_lateness, lateness)
+            self.metrics.lateness.record(lateness)
 
-    async def wait_for_active_timer(self) -> asyncpg.Record:
-        data = await self.fetch_closest_timer()
+            listeners = self.bot.extra_events.get('on_timer_expire', [])
+            results = await asyncio.gather(*(listener(timer) for listener in listeners), return_exceptions=True)
 
-        if data is not None:
-            self._have_data.set()
-            return data
+        for result in results:
+            if isinstance(result, Exception):
+                log.error('Ignoring exception in a timer_expire listener for timer %s', timer.id, exc_info=result)
 
-        self._have_data.clear()
-        self.current = None
+    async def _turn_wheel(self) -> None:
+        # Only runs while the wheel holds timers, create_timer starts it again
+        while self._wheel:
+            await asyncio.sleep(self.WHEEL_RESOLUTION)
 
-        await self._have_data.wait()  # Holds until set
+            now = datetime.datetime.now(tz=datetime.UTC)
+            expired = self._wheel.advance(now)
+            if not expired:
+                continue
 
-        return await self.fetch_closest_timer()  # pyright: ignore[reportReturnType]
+            for timer in expired:
+                if timer.recurrence is not None:
+                    # Back in the wheel before firing, so it can be cancelled while its listeners run
+                    skipped = math.floor((now - timer.expires) / timer.recurrence) + 1
+                    self._wheel.add(Timer({**vars(timer), 'expires': timer.expires + timer.recurrence * skipped}))
 
-    async def fetch_closest_timer(self) -> asyncpg.Record | None:
-        query = """
-                SELECT
-                    *
-                FROM
-                    Timers
-                WHERE
-                    expires < (CURRENT_TIMESTAMP + $1::interval)
-                ORDER BY
-                    expires
-                LIMIT
-                    1;
-                """
-        return await self.bot.pool.fetchrow(query, datetime.timedelta(days=40))
+            self._spawn(self._fire_ephemeral(expired))
 
-    async def call_timer(self, timer: Timer) -> None:
-        self.bot.dispatch('timer_expire', timer)
+    async def _fire_ephemeral(self, timers: list[Timer]) -> None:
+        batch = TimerBatch(size=len(timers))
+        self.batches.append(batch)
 
-        await self.bot.pool.execute('DELETE FROM Timers WHERE id = $1', timer.id)
+        start = time.perf_counter()
+        await asyncio.gather(*(self._fire(batch, timer) for timer in timers))
+        batch.duration = time.perf_counter() - start
+
+    def _spawn(self, coro: Coroutine[Any, Any, None]) -> None:
+        task = asyncio.create_task(coro)
+        self._fire_tasks.add(task)
+        task.add_done_callback(self._fire_tasks.discard)
 
     async def create_timer(
         self,
@@ -147,34 +574,75 @@ class TimerManager:
         *,
         user: discord.User | discord.Member,
         reserved_type: int | None = None,
-        data: dict[Any, Any] | None = None,
+        data: TimerPayload | dict[str, Any] | None = None,
+        every: datetime.timedelta | None = None,
+        persist: bool | None = None,
     ) -> Timer:
-        record = await self.bot.pool.fetchrow(
-            """
-            INSERT INTO
-                Timers (user_id, expires, reserved_type, data)
-            VALUES
-                ($1, $2, $3, $4)
-            RETURNING
-                *;
-            """,
-            user.id,
-            when,
-            reserved_type,
-            data,
-        )
+        """
+        Create a timer which fires the ``timer_expire`` event.
+
+        Parameters
+        ----------
+        when : datetime.datetime
+            When the timer expires first
+        user : discord.User | discord.Member
+            The user the timer belongs to
+        reserved_type : int | None, optional
+            The reserved type of the timer, by default None
+        data : TimerPayload | dict[str, Any] | None, optional
+            The payload of the timer, by default None
+        every : datetime.timedelta | None, optional
+            How often the timer repeats after it first expires, by default None.
+            A recurring timer is kept until it is cancelled.
+        persist : bool | None, optional
+            Whether the timer is stored in the database and survives restarts, by default None.
+            When None, only one-shot timers expiring within EPHEMERAL_THRESHOLD aren't persisted.
+
+        Returns
+        -------
+        Timer
+            The created timer
+
+        Raises
+        ------
+        ValueError
+            Raised when the timer repeats more often than the batch tolerance, as occurrences
+            within the same batch would be skipped
+
+        """
+        if every is not None and every < self.BATCH_TOLERANCE:
+            msg = f'Expected an interval of at least {self.BATCH_TOLERANCE}.'
+            raise ValueError(msg)
+
+        if dataclasses.is_dataclass(data):
+            data = dataclasses.asdict(data)
+
+        if persist is None:
+            persist = every is not None or when - datetime.datetime.now(tz=datetime.UTC) > self.EPHEMERAL_THRESHOLD
+
+        if not persist:
+            timer = Timer({
+                'id': next(self._ephemeral_ids),
+                'user_id': user.id,
+                'reserved_type': reserved_type,
+                'expires': when,
+                'data': data,
+                'recurrence': every,
+            })
+            self._wheel.add(timer)
+
+            if self._wheel_task is None or self._wheel_task.done():
+                self._wheel_task = self.loop.create_task(self._turn_wheel())
+
+            return timer
+
+        record = await self.bot.db.fetchrow('timers.insert', user.id, when, reserved_type, data, every)
         assert record is not None
 
         timer = Timer(record)
 
-        now = datetime.datetime.now(tz=datetime.UTC)
-        dur = when - now
-
-        if dur.total_seconds() <= (86400 * 40):
-            self._have_data.set()
-
-        if self.current and when < self.current.expires:
-            self.restart_task()
+        if when - datetime.datetime.now(tz=datetime.UTC) <= self.HORIZON:
+            self._schedule(timer)
 
         return timer
 
@@ -184,38 +652,124 @@ class TimerManager:
         id: int | None = None,
         user: discord.User | discord.Member | None = None,
         reserved_type: ReservedTimerType | None = None,
-    ) -> None:
+    ) -> list[int]:
+        """
+        Cancel every timer matching all of the given filters.
+
+        Parameters
+        ----------
+        id : int | None, optional
+            The ID of the timer, by default None
+        user : discord.User | discord.Member | None, optional
+            The user the timers belong to, by default None
+        reserved_type : ReservedTimerType | None, optional
+            The reserved type of the timers, by default None
+
+        Returns
+        -------
+        list[int]
+            The IDs of the cancelled timers
+
+        Raises
+        ------
+        TypeError
+            Raised when none of the filters are given
+
+        """
         if id is None and user is None and reserved_type is None:
             raise TypeError('Expected at least one of the kwargs.')
 
-        query = 'DELETE FROM Timers WHERE '
-
-        params: list[str] = []
-        args: list[Any] = []
-
-        if id:
-            params.append(f'id = ${len(params) + 1}')
-            args.append(id)
-
-        if user:
-            params.append(f'user_id = ${len(params) + 1}')
-            args.append(user.id)
-
-        if reserved_type:
-            params.append(f'reserved_type = ${len(params) + 1}')
-            args.append(reserved_type)
-
-        query += ' AND '.join(params)
+        ephemeral = [
+            timer.id
+            for timer in self._wheel
+            if (id is None or timer.id == id)
+            and (user is None or timer.user_id == user.id)
+            and (reserved_type is None or timer.reserved_type == reserved_type)
+        ]
+        for timer_id in ephemeral:
+            self._wheel.remove(timer_id)
+
+        if id is not None and id < 0:
+            return ephemeral
+
+        records = await self.bot.db.fetch('timers.cancel', id, user.id if user else None, reserved_type)
+        return ephemeral + self._forget([record['id'] for record in records])
+
+    async def cancel_timers(self, ids: Iterable[int]) -> list[int]:
+        """
+        Cancel many timers by ID in a single query.
+
+        Parameters
+        ----------
+        ids : Iterable[int]
+            The IDs of the timers
+
+        Returns
+        -------
+        list[int]
+            The IDs of the timers which existed and were cancelled
+
+        """
+        ids = list(ids)
+        ephemeral = [timer_id for timer_id in ids if timer_id < 0 and self._wheel.remove(timer_id)]
+
+        persisted = [timer_id for timer_id in ids if timer_id > 0]
+        if not persisted:
+            return ephemeral
+
+        records = await self.bot.db.fetch('timers.cancel_many', persisted)
+        return ephemeral + self._forget([record['id'] for record in records])
+
+    def _forget(self, ids: list[int]) -> list[int]:
+        # Their heap entries are skipped once they reach the top
+        for timer_id in ids:
+            self._timers.pop(timer_id, None)
+
+        if self.current is not None and self.current.id in ids:
+            self.current = None
+            self._changed.set()  # The dispatcher is sleeping towards a cancelled timer
+
+        return ids
+
+    @property
+    def queue_depth(self) -> int:
+        """The amount of timers within the horizon waiting to be fired by this process."""
+        return len(self._timers) + len(self._wheel)
+
+    @property
+    def in_flight(self) -> int:
+        """The amount of batches being fired."""
+        return len(self._fire_tasks)
+
+    def restart_task(self, reason: str, *, detail: str | None = None, delay: float = 0.0) -> None:
+        """
+        Drop the heap and reload it from the database in a new dispatcher task.
+
+        Parameters
+        ----------
+        reason : str
+            Why the dispatcher is restarted, restarts are counted per reason
+        detail : str | None, optional
+            A longer description of the reason kept with the recent restarts, by default None
+        delay : float, optional
+            Seconds the new dispatcher waits before reloading, by default 0.0
+
+        """
+        self.metrics.record_restart(reason, detail, delay)
+        self.task.cancel()
 
-        await self.bot.pool.execute(
-            query,
-            *args,
-        )
-        self.restart_task()
+        self.current = None
+        self._heap.clear()
+        self._timers.clear()
+        self._window_end = None
 
-    def restart_task(self) -> None:
-        self.task.cancel()
-        self.task = self.loop.create_task(self.dispatch_timers())
+        self.task = self.loop.create_task(self.dispatch_timers(delay))
 
     def close(self) -> None:
         self.task.cancel()
+
+        if self._wheel_task is not None:
+            self._wheel_task.cancel()
+
+        for task in self._fire_tasks:
+            task.cancel()